@@ -0,0 +1,327 @@
+purpose = '''
+Benchmark harness for the collision-detection pipeline.
+Generates synthetic TLE catalogs (complete_preprocessing.py column schema) with fixed seeds, measures throughput
+and peak traced memory of the hot paths, and compares the results against a baseline recorded on the same host
+(benchmarks/baselines/<host>.json, not committed). Throughputs are normalized by a calibration kernel timed next
+to each benchmark, so background load does not read as a regression.
+Runs offline; benchmarks whose optional dependencies (TensorFlow, matplotlib) are missing are skipped.
+
+python benchmarks/run_benchmarks.py                      # compare against this host's baseline, exit 1 on a regression
+                                                         # (the first run on a host records the baseline instead)
+python benchmarks/run_benchmarks.py --update-baseline    # record the current numbers as this host's baseline
+'''
+
+import os
+import io
+import sys
+import json
+import time
+import random
+import shutil
+import platform
+import argparse
+import tempfile
+import tracemalloc
+import contextlib
+import importlib.util
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:0] = [os.path.join(ROOT, 'src'), os.path.join(ROOT, 'data')]
+os.environ.setdefault('MPLBACKEND', 'Agg')
+os.environ.setdefault('TF_CPP_MIN_LOG_LEVEL', '2')
+
+from catalog_propagator import CatalogPropagator
+from spatial_index import SpatialIndex
+from trajectory_equations import CompiledTrajectory
+from complete_preprocessing import TLE_COLUMNS, parse_tle_pair, preprocess_and_format_tle_streaming
+
+BASELINE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baselines')
+CATALOG_SIZES = (1000, 10000, 100000)
+SEED = 1234
+REPEATS = 5  # Timed rounds per benchmark; the fastest round is kept, since noise only ever slows a round down
+ROUND_TIME = 0.2  # Minimum seconds per round
+CALIBRATION_REPEATS = 20  # The calibration kernel takes ~10 ms, so it needs more rounds to find its floor
+
+# Example ascent trajectory, as produced by initial_trajectory.py
+TRAJECTORY = {
+    'x': "x(t) = 13.719 + 9.8 * t * cos(0.7853981633974483) * cos(0.0)",
+    'y': "y(t) = 8.2304 + 9.8 * t * cos(0.7853981633974483) * sin(0.0)",
+    'z': "z(t) = 0.0 + 9.8 * t * sin(0.7853981633974483)",
+    'theta': "theta(t) = 0.7853981633974483 * (1 - exp(-0.1 * t))",
+}
+
+
+def synthetic_tle_lines(num_objects, seed=SEED):
+    """
+    Generates TLE text lines for num_objects random objects.
+
+    Parameters:
+    - num_objects (int): Number of TLE entries.
+    - seed (int): Random seed; the same seed always yields the same catalog.
+
+    Returns:
+    - list: Alternating line 1 / line 2 strings with trailing newlines.
+    """
+    rng = np.random.default_rng(seed)
+    satellite_nums = rng.choice(99999, size=num_objects, replace=num_objects > 99999) + 1
+    epochs = 24000 + rng.uniform(1, 365, num_objects)
+    inclinations = rng.uniform(0, 180, num_objects)
+    raans = rng.uniform(0, 360, num_objects)
+    eccentricities = rng.integers(0, 250000, num_objects)
+    perigees = rng.uniform(0, 360, num_objects)
+    anomalies = rng.uniform(0, 360, num_objects)
+    mean_motions = rng.uniform(1, 16.5, num_objects)
+    revs = rng.integers(0, 99999, num_objects)
+
+    lines = []
+    for i in range(num_objects):
+        lines.append(f"1 {satellite_nums[i]:05d}U 98067A   {epochs[i]:014.8f}  .00016717  00000-0  10270-3 0  9005\n")
+        lines.append(f"2 {satellite_nums[i]:05d} {inclinations[i]:8.4f} {raans[i]:8.4f} {eccentricities[i]:07d} "
+                     f"{perigees[i]:8.4f} {anomalies[i]:8.4f} {mean_motions[i]:11.8f}{revs[i]:5d}7\n")
+    return lines
+
+
+def synthetic_catalog(num_objects, seed=SEED):
+    # The catalog as the detector sees it: parsed into the TLE_COLUMNS schema and read back from CSV
+    lines = synthetic_tle_lines(num_objects, seed)
+    rows = [parse_tle_pair(lines[i].strip(), lines[i + 1].strip()) for i in range(0, len(lines), 2)]
+    csv = io.StringIO()
+    pd.DataFrame(rows, columns=TLE_COLUMNS).to_csv(csv, index=False)
+    csv.seek(0)
+    return pd.read_csv(csv, low_memory=False)
+
+
+def host_baseline_path():
+    # Baselines only mean something on the machine that recorded them, so each host keeps its own file
+    host = f"{platform.node()}-{platform.machine()}-{os.cpu_count()}cpu"
+    return os.path.join(BASELINE_DIR, "".join(c if c.isalnum() or c in "-_." else "_" for c in host) + ".json")
+
+
+def calibration_seconds():
+    """
+    Times a fixed NumPy and pure-Python kernel, best of CALIBRATION_REPEATS.
+
+    Measured before and after each benchmark; throughputs are multiplied by it before comparison, so a
+    run slowed down as a whole (other load, frequency scaling) is not reported as a regression.
+    """
+    values = np.random.default_rng(SEED).random(200000)
+    best = np.inf
+    for _ in range(CALIBRATION_REPEATS):
+        started = time.perf_counter()
+        np.sort(np.sin(values) * np.cos(values))
+        sum(i * i for i in range(50000))
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def measure(fn, units):
+    """
+    Times fn (after one warm-up call) in REPEATS rounds of at least ROUND_TIME seconds, keeping the fastest,
+    then traces the peak memory of one call.
+
+    Returns:
+    - dict: Throughput in units per second, seconds per call and peak traced allocation in MiB.
+    """
+    fn()
+    best = np.inf
+    for _ in range(REPEATS):
+        calls = 0
+        started = time.perf_counter()
+        while True:
+            fn()
+            calls += 1
+            elapsed = time.perf_counter() - started
+            if elapsed >= ROUND_TIME:
+                break
+        best = min(best, elapsed / calls)
+
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {'throughput': units / best, 'seconds_per_call': best, 'peak_mib': peak / 2 ** 20}
+
+
+def _detector(catalog, work_dir, **kwargs):
+    from double_deep_dynamic_collision_detection import DeepDynamicCollisionDetection
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        detector = DeepDynamicCollisionDetection(dict(TRAJECTORY), "PSLV", ["Sriharikota"], (13.719, 80.2304), 500,
+                                                 [200, 2000], "LEO", "2024-11-09 12:00:00", catalog, verbosity=0, **kwargs)
+    # Keep checkpoints written during benchmarks out of the real checkpoint directory
+    detector.checkpoint_path = os.path.join(work_dir, "benchmark.weights.h5")
+    detector.checkpointer.checkpoint_path = detector.checkpoint_path
+    return detector
+
+
+def benchmarks(sizes, work_dir):
+    # Yields (name, required modules, unit, setup) where setup() returns (fn, units of work per call)
+    for n in sizes:
+        def propagation(n=n):
+            propagator = CatalogPropagator(synthetic_catalog(n))
+            times = np.arange(100, dtype=np.float64)
+            return (lambda: propagator.positions(times)), n * len(times)
+        yield f"satellite_positions[n={n}]", (), "object-steps/s", propagation
+
+        def collision_scan(n=n):
+            from double_deep_dynamic_collision_detection import DeepDynamicCollisionDetection
+            positions = CatalogPropagator(synthetic_catalog(n)).positions(10.0)
+            rocket = CompiledTrajectory(TRAJECTORY)(np.arange(100, dtype=np.float64))
+            return (lambda: [DeepDynamicCollisionDetection.detect_collision(p, positions) for p in rocket]), len(rocket)
+        yield f"detect_collision[n={n}]", (), "queries/s", collision_scan
+
+        def collision_index(n=n):
+            positions = CatalogPropagator(synthetic_catalog(n)).positions(10.0)
+            rocket = CompiledTrajectory(TRAJECTORY)(np.arange(1000, dtype=np.float64))
+            return (lambda: SpatialIndex(positions).nearest_within(rocket, 1.0)), len(rocket)
+        yield f"spatial_index_build_query[n={n}]", (), "queries/s", collision_index
+
+        def screening(n=n):
+            from conjunction_screening import ConjunctionScreener
+            screener = ConjunctionScreener(TRAJECTORY, CatalogPropagator(synthetic_catalog(n)))
+            return (lambda: screener.screen(0.0, 100.0)), n
+        yield f"conjunction_screening[n={n},t=100]", (), "objects/s", screening
+
+        def preprocessing(n=n):
+            input_path = os.path.join(work_dir, f"tle_{n}.txt")
+            with open(input_path, 'w') as file:
+                file.writelines(synthetic_tle_lines(n))
+            output_path = os.path.join(work_dir, f"tle_{n}.csv")
+
+            def run():
+                with contextlib.redirect_stdout(io.StringIO()):
+                    preprocess_and_format_tle_streaming(input_path, output_path)
+            return run, n
+        yield f"tle_preprocessing[n={n}]", (), "TLEs/s", preprocessing
+
+    def rocket_position():
+        trajectory = CompiledTrajectory(TRAJECTORY)
+        times = np.linspace(0, 1000, 10000)
+        return (lambda: trajectory(times)), len(times)
+    yield "rocket_position[t=10000]", (), "times/s", rocket_position
+
+    def visualizer_sampling():
+        from initial_trajectory_visualization import TrajectoryVisualizer
+        visualizer = TrajectoryVisualizer(TRAJECTORY, (0, 1000), num_points=100000)
+        return (lambda: [f(visualizer.t_values) for f in (visualizer.x_func, visualizer.y_func, visualizer.z_func, visualizer.theta_func)]), 100000
+    yield "trajectory_visualizer_sampling[points=100000]", ("matplotlib",), "points/s", visualizer_sampling
+
+    for compiled in (False, True):
+        def replay(compiled=compiled):
+            detector = _detector(synthetic_catalog(10000), work_dir, compiled_train_step=compiled)
+            rng = np.random.default_rng(SEED)
+            states = rng.normal(size=(2000, detector.state_size)).astype(np.float32)
+            detector.memory.rng = np.random.default_rng(SEED)
+            detector.memory.extend(states, rng.integers(0, detector.action_size, 2000), rng.normal(size=2000), states + 1, rng.random(2000) < 0.05)
+            return (lambda: detector.replay(64)), 1
+        yield f"replay[batch=64{',compiled' if compiled else ''}]", ("tensorflow",), "updates/s", replay
+
+    def training_episode():
+        # Compiled train step: with predict/fit, Keras call overhead dominates and an episode takes tens of seconds
+        detector = _detector(synthetic_catalog(10000), work_dir, compiled_train_step=True)
+
+        def run():
+            # Fresh-run exploration rate and the same random draws every call, so later calls do not exploit (predict) more
+            random.seed(SEED)
+            np.random.seed(SEED)
+            detector.exploration_rate = 1.0
+            with contextlib.redirect_stdout(io.StringIO()):
+                detector.train(num_episodes=1, max_steps=100)
+        return run, 1
+    yield "train_episode[n=10000,steps=100,compiled]", ("tensorflow",), "episodes/s", training_episode
+
+
+def run_benchmarks(sizes=CATALOG_SIZES, only=None):
+    """
+    Runs every benchmark whose dependencies are installed.
+
+    Parameters:
+    - sizes (tuple): Synthetic catalog sizes.
+    - only (str): Optional substring; only benchmarks whose name contains it are run.
+
+    Returns:
+    - dict: Results keyed by benchmark name; skipped benchmarks carry a 'skipped' reason.
+    """
+    results = {}
+    work_dir = tempfile.mkdtemp(prefix="benchmarks_")
+    try:
+        for name, requires, unit, setup in benchmarks(sizes, work_dir):
+            if only and only not in name:
+                continue
+            missing = [module for module in requires if importlib.util.find_spec(module) is None]
+            if missing:
+                results[name] = {'skipped': f"missing {', '.join(missing)}"}
+                print(f"{name:<48} skipped (missing {', '.join(missing)})")
+                continue
+            np.random.seed(SEED)
+            fn, units = setup()
+            calibration = calibration_seconds()
+            results[name] = dict(measure(fn, units), unit=unit)
+            # Throughput in units per calibration kernel run, comparable across differently loaded runs
+            results[name]['normalized'] = results[name]['throughput'] * min(calibration, calibration_seconds())
+            print(f"{name:<48} {results[name]['throughput']:>14.4g} {unit:<16} peak {results[name]['peak_mib']:8.1f} MiB")
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+    return results
+
+
+def compare(results, baseline, tolerance):
+    """
+    Compares results with the baseline.
+
+    A benchmark regresses when its calibration-normalized throughput drops by more than tolerance (a fraction)
+    or its peak memory grows by more than tolerance plus 1 MiB of slack.
+
+    Returns:
+    - list: Human-readable descriptions of the regressions found.
+    """
+    regressions = []
+    for name, result in results.items():
+        reference = baseline.get(name)
+        if 'skipped' in result or reference is None or 'skipped' in reference:
+            continue
+        if result['normalized'] < reference['normalized'] * (1.0 - tolerance):
+            regressions.append(f"{name}: normalized throughput is {1.0 - result['normalized'] / reference['normalized']:.0%} below "
+                               f"the baseline ({result['throughput']:.1f} {result['unit']} now, {reference['throughput']:.1f} recorded)")
+        if result['peak_mib'] > reference['peak_mib'] * (1.0 + tolerance) + 1.0:
+            regressions.append(f"{name}: peak memory {result['peak_mib']:.1f} MiB exceeds the baseline {reference['peak_mib']:.1f} MiB")
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the benchmarks and compare them against the stored baseline.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(CATALOG_SIZES), help="Synthetic catalog sizes.")
+    parser.add_argument("--only", help="Run only benchmarks whose name contains this string.")
+    parser.add_argument("--tolerance", type=float, default=0.3, help="Allowed relative slowdown / memory growth.")
+    parser.add_argument("--baseline", default=None, help="Baseline file (default: this host's file in benchmarks/baselines).")
+    parser.add_argument("--update-baseline", action="store_true", help="Store these results as the new baseline.")
+    args = parser.parse_args()
+    args.baseline = args.baseline or host_baseline_path()
+
+    results = run_benchmarks(tuple(args.sizes), args.only)
+
+    if args.update_baseline or not os.path.exists(args.baseline):
+        # A host without a baseline records one instead of comparing against another machine's numbers
+        baseline = {}
+        if os.path.exists(args.baseline):
+            with open(args.baseline) as file:
+                baseline = json.load(file)
+        # Skipped benchmarks keep their previous baseline entry
+        baseline.update({name: result for name, result in results.items() if 'skipped' not in result})
+        os.makedirs(os.path.dirname(args.baseline) or ".", exist_ok=True)
+        with open(args.baseline, 'w') as file:
+            json.dump(dict(sorted(baseline.items())), file, indent=2)
+            file.write("\n")
+        print(f"Baseline written to {args.baseline}")
+        sys.exit(0)
+
+    with open(args.baseline) as file:
+        regressions = compare(results, json.load(file), args.tolerance)
+    if regressions:
+        print("\nPERFORMANCE REGRESSIONS:")
+        for regression in regressions:
+            print(f"  - {regression}")
+        sys.exit(1)
+    print("\nNo regressions against the baseline.")
@@ -1,28 +1,92 @@
 import os
+import sys
+import threading
 import pandas as pd
 import numpy as np
 import re
 
+# Catalog storage helpers shared with the analysis code
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+from tle_store import normalize_tle_columns, write_tle_store, update_tle_store
+
+
+def iter_tle_pairs(lines, carry=None):
+    # Lazily pair Line 1 / Line 2 of each TLE entry from any iterable of lines (e.g. an open file)
+    # With a carry dict, an unmatched trailing Line 1 is kept in carry['pending'] and paired on the next call
+    pending = carry.get('pending') if carry is not None else None
+    for line in lines:
+        # Remove empty lines and comments
+        if not line.strip() or line.startswith('#'):
+            continue
+        line = line.strip()
+
+        # Ensure that each TLE entry has two lines (Line 1 and Line 2); skip invalid or incomplete entries
+        if pending is not None and re.match(r'^2 ', line):
+            yield pending, line
+            pending = None
+        else:
+            pending = line if re.match(r'^1 ', line) else None
+
+    if carry is not None:
+        carry['pending'] = pending
 
-def advanced_preprocess_tle(lines):
-    # Remove empty lines and comments
-    lines = [line.strip() for line in lines if line.strip() and not line.startswith('#')]
 
-    # Ensure that each TLE entry has two lines (Line 1 and Line 2)
+def advanced_preprocess_tle(lines):
+    # Remove empty lines and comments, and keep only complete Line 1 / Line 2 pairs
     processed_lines = []
-    i = 0
-    while i < len(lines):
-        if i + 1 < len(lines) and re.match(r'^1 ', lines[i]) and re.match(r'^2 ', lines[i + 1]):
-            processed_lines.append(lines[i])
-            processed_lines.append(lines[i + 1])
-            i += 2
-        else:
-            # Skip invalid or incomplete entries
-            i += 1
+    for line1, line2 in iter_tle_pairs(lines):
+        processed_lines.append(line1)
+        processed_lines.append(line2)
 
     return processed_lines
 
 
+TLE_COLUMNS = [
+    'Line1_Num', 'Satellite_Num', 'Intl_Designator', 'Epoch_Year_Day', 'First_Derivative',
+    'Second_Derivative', 'BSTAR', 'Ephemeris_Type', 'Element_Set_Num',
+    'Line2_Num', 'Satellite_Num_2', 'Inclination_deg', 'RAAN_deg', 'Eccentricity',
+    'Argument_of_Perigee_deg', 'Mean_Anomaly_deg', 'Mean_Motion', 'Rev_at_Epoch'
+]
+
+
+def parse_tle_pair(line1, line2):
+    # Parse line 1
+    line1_data = [
+        line1[0],  # Line number
+        line1[2:7].strip(),  # Satellite number
+        line1[9:17].strip(),  # International designator
+        line1[18:32].strip(),  # Epoch year and day
+        line1[33:43].strip(),  # First derivative of mean motion
+        line1[44:52].strip(),  # Second derivative of mean motion
+        line1[53:61].strip(),  # BSTAR drag term
+        line1[62:63].strip(),  # Ephemeris type
+        line1[64:68].strip(),  # Element set number
+    ]
+
+    # Parse line 2
+    line2_data = [
+        line2[0],  # Line number
+        line2[2:7].strip(),  # Satellite number
+        line2[8:16].strip(),  # Inclination (degrees)
+        line2[17:25].strip(),  # RAAN (degrees)
+        line2[26:33].strip(),  # Eccentricity (decimal)
+        line2[34:42].strip(),  # Argument of perigee (degrees)
+        line2[43:51].strip(),  # Mean anomaly (degrees)
+        line2[52:63].strip(),  # Mean motion (revolutions per day)
+        line2[63:68].strip(),  # Revolution number at epoch
+    ]
+
+    return line1_data + line2_data
+
+
+def _output_columns(output_csv_path):
+    # Load existing CSV header to retain column names if they exist
+    if os.path.exists(output_csv_path):
+        return pd.read_csv(output_csv_path, nrows=0).columns.tolist()
+    # Define default column names
+    return TLE_COLUMNS
+
+
 def preprocess_and_format_tle(input_txt_path, output_csv_path):
     # Load TLE text file
     with open(input_txt_path, 'r') as file:
@@ -35,59 +99,151 @@ def preprocess_and_format_tle(input_txt_path, output_csv_path):
     data = []
     for i in range(0, len(lines), 2):
         if i + 1 < len(lines):
-            line1 = lines[i].strip()
-            line2 = lines[i + 1].strip()
-
-            # Parse line 1
-            line1_data = [
-                line1[0],  # Line number
-                line1[2:7].strip(),  # Satellite number
-                line1[9:17].strip(),  # International designator
-                line1[18:32].strip(),  # Epoch year and day
-                line1[33:43].strip(),  # First derivative of mean motion
-                line1[44:52].strip(),  # Second derivative of mean motion
-                line1[53:61].strip(),  # BSTAR drag term
-                line1[62:63].strip(),  # Ephemeris type
-                line1[64:68].strip(),  # Element set number
-            ]
-
-            # Parse line 2
-            line2_data = [
-                line2[0],  # Line number
-                line2[2:7].strip(),  # Satellite number
-                line2[8:16].strip(),  # Inclination (degrees)
-                line2[17:25].strip(),  # RAAN (degrees)
-                line2[26:33].strip(),  # Eccentricity (decimal)
-                line2[34:42].strip(),  # Argument of perigee (degrees)
-                line2[43:51].strip(),  # Mean anomaly (degrees)
-                line2[52:63].strip(),  # Mean motion (revolutions per day)
-                line2[63:68].strip(),  # Revolution number at epoch
-            ]
-
             # Append parsed line data to main data list
-            data.append(line1_data + line2_data)
-
-    # Load existing CSV to retain column names if they exist
-    if os.path.exists(output_csv_path):
-        existing_df = pd.read_csv(output_csv_path)
-        columns = existing_df.columns.tolist()
-    else:
-        # Define default column names
-        columns = [
-            'Line1_Num', 'Satellite_Num', 'Intl_Designator', 'Epoch_Year_Day', 'First_Derivative',
-            'Second_Derivative', 'BSTAR', 'Ephemeris_Type', 'Element_Set_Num',
-            'Line2_Num', 'Satellite_Num_2', 'Inclination_deg', 'RAAN_deg', 'Eccentricity',
-            'Argument_of_Perigee_deg', 'Mean_Anomaly_deg', 'Mean_Motion', 'Rev_at_Epoch'
-        ]
+            data.append(parse_tle_pair(lines[i].strip(), lines[i + 1].strip()))
 
     # Convert to DataFrame
-    tle_df = pd.DataFrame(data, columns=columns)
+    tle_df = pd.DataFrame(data, columns=_output_columns(output_csv_path))
 
     # Save DataFrame to CSV
     tle_df.to_csv(output_csv_path, index=False)
     print(f"CSV file saved successfully at: {output_csv_path}")
 
 
+def preprocess_and_format_tle_streaming(input_txt_path, output_csv_path, chunk_size=100000):
+    # Same output as preprocess_and_format_tle, but the input is read line by line and parsed rows are written
+    # out every chunk_size entries, so memory use stays constant regardless of the archive size
+    columns = _output_columns(output_csv_path)
+    temp_csv_path = f"{output_csv_path}.tmp"
+    num_rows = 0
+
+    with open(input_txt_path, 'r') as file:
+        chunk = []
+        mode, header = 'w', True
+        for line1, line2 in iter_tle_pairs(file):
+            chunk.append(parse_tle_pair(line1, line2))
+            if len(chunk) >= chunk_size:
+                pd.DataFrame(chunk, columns=columns).to_csv(temp_csv_path, mode=mode, header=header, index=False)
+                num_rows += len(chunk)
+                chunk, mode, header = [], 'a', False
+        if chunk or header:
+            pd.DataFrame(chunk, columns=columns).to_csv(temp_csv_path, mode=mode, header=header, index=False)
+            num_rows += len(chunk)
+
+    # Replace the previous CSV only once the new one is complete
+    os.replace(temp_csv_path, output_csv_path)
+    print(f"CSV file saved successfully at: {output_csv_path} ({num_rows} entries)")
+
+
+def preprocess_and_format_tle_store(input_txt_path, output_store_path, chunk_size=100000):
+    # Parse the TLE text into a typed binary columnar store (see tle_store.py) instead of a CSV of strings
+    # Chunks are converted to typed columns as they are parsed, so only compact arrays are held in memory
+    chunks = []
+    rows = []
+    with open(input_txt_path, 'r') as file:
+        for line1, line2 in iter_tle_pairs(file):
+            rows.append(parse_tle_pair(line1, line2))
+            if len(rows) >= chunk_size:
+                chunks.append(normalize_tle_columns(pd.DataFrame(rows, columns=TLE_COLUMNS)))
+                rows = []
+    chunks.append(normalize_tle_columns(pd.DataFrame(rows, columns=TLE_COLUMNS)))
+
+    tle_df = pd.concat(chunks, ignore_index=True)
+    tle_df.attrs.update(chunks[0].attrs)
+    write_tle_store(tle_df, output_store_path)
+    print(f"TLE store saved successfully at: {output_store_path} ({len(tle_df)} entries)")
+
+
+def preprocess_and_update_tle_store(input_txt_path, store_path):
+    # Merge a new TLE drop into an existing store instead of rebuilding it
+    # Keeps the newest Epoch_Year_Day per Satellite_Num and returns which objects were added or updated
+    with open(input_txt_path, 'r') as file:
+        new_df = pd.DataFrame([parse_tle_pair(line1, line2) for line1, line2 in iter_tle_pairs(file)], columns=TLE_COLUMNS)
+
+    report = update_tle_store(new_df, store_path)
+    print(f"TLE store updated at: {store_path} ({len(report['added'])} added, {len(report['updated'])} updated, {report['unchanged']} unchanged, {report['skipped']} skipped without a catalog number)")
+    return report
+
+
+class TLEFileFollower:
+    def __init__(self, input_txt_path, on_update, poll_interval=5.0, from_start=True):
+        """
+        Follows a TLE text file that another job keeps appending to.
+
+        Each poll reads only the bytes appended since the previous one, pairs complete Line 1 / Line 2
+        entries with iter_tle_pairs (a trailing partial line or unmatched Line 1 waits for the next poll)
+        and passes the parsed rows to on_update, e.g. DeepDynamicCollisionDetection.apply_catalog_update.
+
+        Parameters:
+        - input_txt_path (str): The TLE text file to follow.
+        - on_update (Callable): Called with a DataFrame of new entries in the TLE_COLUMNS schema.
+        - poll_interval (float): Seconds between polls when running in the background.
+        - from_start (bool): Parse the existing file contents first instead of starting at its end.
+        """
+        self.input_txt_path = input_txt_path
+        self.on_update = on_update
+        self.poll_interval = poll_interval
+        self._stop = threading.Event()
+        self._thread = None
+        self._reset()
+        if not from_start and os.path.exists(input_txt_path):
+            self.offset = os.path.getsize(input_txt_path)
+            self.inode = os.stat(input_txt_path).st_ino
+
+    def _reset(self):
+        self.offset = 0
+        self.inode = None
+        self.partial_line = ''
+        self.carry = {}
+
+    def poll(self):
+        # Parse whatever complete entries were appended since the last poll; returns the number of new entries
+        if not os.path.exists(self.input_txt_path):
+            return 0
+        stat = os.stat(self.input_txt_path)
+        if stat.st_ino != self.inode or stat.st_size < self.offset:
+            # The file was replaced or truncated; start over from its beginning
+            self._reset()
+            self.inode = stat.st_ino
+
+        with open(self.input_txt_path, 'rb') as file:
+            file.seek(self.offset)
+            appended = file.read()
+            self.offset = file.tell()
+        if not appended:
+            return 0
+
+        lines = (self.partial_line + appended.decode('ascii', errors='replace')).split('\n')
+        self.partial_line = lines.pop()  # Not newline-terminated yet; the writer may still be mid-line
+        rows = [parse_tle_pair(line1, line2) for line1, line2 in iter_tle_pairs(lines, carry=self.carry)]
+        if rows:
+            self.on_update(pd.DataFrame(rows, columns=TLE_COLUMNS))
+        return len(rows)
+
+    def run(self):
+        # Poll until stop() is called
+        while not self._stop.is_set():
+            try:
+                self.poll()
+            except Exception as e:
+                print(f"Error following TLE file: {e}")
+            self._stop.wait(self.poll_interval)
+
+    def start(self):
+        # Follow the file on a daemon thread; on_update is then called from that thread
+        self._stop.clear()
+        self._thread = threading.Thread(target=self.run, name="tle-follower", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+
 # Example usage
-preprocess_and_format_tle('/Users/thrishank/Documents/Projects/Project_Space_Debris_&_Route_Calculation/Space-Debris-and-Route-Calculation/data/raw_data.txt',
-                          '/Users/thrishank/Documents/Projects/Project_Space_Debris_&_Route_Calculation/Space-Debris-and-Route-Calculation/data/tle_data.csv')
+if __name__ == "__main__":
+    preprocess_and_format_tle('/Users/thrishank/Documents/Projects/Project_Space_Debris_&_Route_Calculation/Space-Debris-and-Route-Calculation/data/raw_data.txt',
+                              '/Users/thrishank/Documents/Projects/Project_Space_Debris_&_Route_Calculation/Space-Debris-and-Route-Calculation/data/tle_data.csv')
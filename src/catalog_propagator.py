@@ -0,0 +1,108 @@
+import numpy as np
+import pandas as pd
+from tle_store import NORMALIZED_ATTR, decode_catalog_numbers
+
+EARTH_MU = 398600.4418  # Earth's gravitational parameter, km^3/s^2
+EARTH_RADIUS = 6378.137  # Equatorial radius, km
+
+
+class CatalogPropagator:
+    def __init__(self, tle_data):
+        """
+        Initializes the CatalogPropagator with a TLE catalog.
+
+        The orbital elements used by the position model are pulled out of the DataFrame once and kept
+        as contiguous float64 columns, so propagating the whole catalog is a handful of NumPy operations
+        instead of a Python loop over rows.
+
+        Parameters:
+        - tle_data (pd.DataFrame): TLE catalog with 'Inclination_deg', 'RAAN_deg', 'Eccentricity' and
+          'Mean_Motion' columns, as written by complete_preprocessing.py (CSV or binary store).
+        """
+        inclination = pd.to_numeric(tle_data['Inclination_deg'], errors='coerce').to_numpy(dtype=np.float64)
+        raan = pd.to_numeric(tle_data['RAAN_deg'], errors='coerce').to_numpy(dtype=np.float64)
+        eccentricity = pd.to_numeric(tle_data['Eccentricity'], errors='coerce').to_numpy(dtype=np.float64)
+        mean_motion = pd.to_numeric(tle_data['Mean_Motion'], errors='coerce').to_numpy(dtype=np.float64)
+
+        # Rows that cannot be parsed are skipped, as the row-by-row loop used to do
+        valid = ~(np.isnan(inclination) | np.isnan(raan) | np.isnan(eccentricity) | np.isnan(mean_motion))
+        self.rows = np.flatnonzero(valid)
+
+        self.inclination = np.ascontiguousarray(inclination[valid])
+        self.raan = np.ascontiguousarray(raan[valid])
+        if not tle_data.attrs.get(NORMALIZED_ATTR, False):
+            eccentricity = eccentricity * 1e-7  # CSV eccentricity keeps the TLE's implied leading decimal point
+        self.eccentricity = np.ascontiguousarray(eccentricity[valid])
+        self.mean_motion = np.ascontiguousarray(mean_motion[valid])
+
+        if 'Satellite_Num' in tle_data.columns:
+            # Decoded the same way as the binary store, so CSV and store catalogs report the same ids
+            self.satellite_ids = decode_catalog_numbers(tle_data['Satellite_Num'])[valid]
+        else:
+            self.satellite_ids = tle_data.index.to_numpy()[valid]
+
+    def __len__(self):
+        return len(self.rows)
+
+    def take(self, indices):
+        # A propagator over a subset of this catalog's objects (indices into the valid rows)
+        subset = object.__new__(CatalogPropagator)
+        for name in ('rows', 'inclination', 'raan', 'eccentricity', 'mean_motion', 'satellite_ids'):
+            setattr(subset, name, np.ascontiguousarray(getattr(self, name)[indices]))
+        return subset
+
+    def altitude_shells(self):
+        """
+        Perigee and apogee altitude of every object, from its mean motion and eccentricity.
+
+        The semi-major axis follows from Kepler's third law, a = (mu / n^2)^(1/3), with n converted from
+        revolutions per day to radians per second. Objects with a non-positive mean motion get NaN.
+
+        Returns:
+        - tuple: (perigee, apogee) arrays of altitudes above the equatorial radius, in km.
+        """
+        mean_motion = self.mean_motion * (2 * np.pi / 86400.0)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            semi_major_axis = np.where(mean_motion > 0, np.cbrt(EARTH_MU / mean_motion ** 2), np.nan)
+        eccentricity = np.abs(self.eccentricity)
+        return semi_major_axis * (1 - eccentricity) - EARTH_RADIUS, semi_major_axis * (1 + eccentricity) - EARTH_RADIUS
+
+    def within_altitude_band(self, low, high, margin=0.0):
+        """
+        Indices of the objects whose [perigee, apogee] shell overlaps [low - margin, high + margin].
+
+        Parameters:
+        - low (float): Lower edge of the altitude band in km.
+        - high (float): Upper edge of the altitude band in km.
+        - margin (float): Widens the band on both sides, in km.
+
+        Returns:
+        - np.ndarray: Indices into this catalog's objects, for take().
+        """
+        perigee, apogee = self.altitude_shells()
+        return np.flatnonzero((perigee <= high + margin) & (apogee >= low - margin))
+
+    def positions(self, t):
+        """
+        Propagates every object in the catalog to time t.
+
+        Parameters:
+        - t (float or array-like): A single time or a vector of T times.
+
+        Returns:
+        - np.ndarray: An (N, 3) array of positions for a scalar t, or a (T, N, 3) array for a vector of times.
+        """
+        t = np.asarray(t, dtype=np.float64)
+        scalar = t.ndim == 0
+        t = np.atleast_1d(t).ravel()
+
+        # Simple approximation for satellite position based on mean motion and time t
+        phase = self.mean_motion[np.newaxis, :] * t[:, np.newaxis]
+        angle = self.raan[np.newaxis, :] + phase
+
+        positions = np.empty((len(t), len(self), 3), dtype=np.float64)
+        np.multiply(self.inclination, np.cos(angle), out=positions[..., 0])
+        np.multiply(self.inclination, np.sin(angle), out=positions[..., 1])
+        np.multiply(self.eccentricity, np.sin(phase), out=positions[..., 2])
+
+        return positions[0] if scalar else positions
@@ -0,0 +1,197 @@
+import os
+import re
+import glob
+import json
+import time
+import threading
+import numpy as np
+
+# Snapshot entries holding lists of arrays (model weights, optimizer variables)
+ARRAY_LIST_KEYS = ('model', 'target_model', 'optimizer')
+
+
+def snapshot_paths(checkpoint_path):
+    """Returns the rotated snapshot files written next to checkpoint_path, oldest written first."""
+    stem = os.path.basename(checkpoint_path).split('.')[0]
+    pattern = re.compile(re.escape(stem) + r"\.ckpt-(\d+)\.npz$")
+    paths = [path for path in glob.glob(os.path.join(os.path.dirname(checkpoint_path), f"{stem}.ckpt-*.npz")) if pattern.search(path)]
+    # Ordered by write time rather than episode, so a new run is never rotated out by an older, longer one
+    return sorted(paths, key=lambda path: (os.path.getmtime(path), int(pattern.search(path).group(1))))
+
+
+def latest_snapshot(checkpoint_path):
+    paths = snapshot_paths(checkpoint_path)
+    return paths[-1] if paths else None
+
+
+def write_snapshot(snapshot, path):
+    """
+    Writes a training snapshot to a single .npz file, atomically.
+
+    Arrays are stored as npz entries ('model/000', 'memory/states', ...) and everything else goes into a
+    JSON 'meta' entry; the file is written under a temporary name and renamed into place, so a crash never
+    leaves a partial snapshot behind.
+
+    Parameters:
+    - snapshot (dict): As returned by DeepDynamicCollisionDetection.training_state().
+    - path (str): Destination .npz path.
+    """
+    arrays, meta = {}, {}
+    for key, value in snapshot.items():
+        if key in ARRAY_LIST_KEYS:
+            arrays.update({f"{key}/{i:03d}": array for i, array in enumerate(value)})
+            meta[key] = len(value)
+        elif isinstance(value, dict):
+            # Nested state (replay buffer, metrics): arrays as '<key>/<name>' entries, the rest in meta
+            arrays.update({f"{key}/{name}": array for name, array in value.items() if isinstance(array, np.ndarray)})
+            meta[key] = {name: item for name, item in value.items() if not isinstance(item, np.ndarray)}
+        elif isinstance(value, np.ndarray):
+            arrays[key] = value
+        else:
+            meta[key] = value
+    arrays['meta'] = np.array(json.dumps(meta, default=lambda item: item.item() if hasattr(item, 'item') else str(item)))
+
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, 'wb') as file:
+        np.savez(file, **arrays)
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(temp_path, path)
+
+
+def read_snapshot(path):
+    """Reads a snapshot written by write_snapshot back into the training_state() layout."""
+    with np.load(path, allow_pickle=False) as data:
+        meta = json.loads(str(data['meta']))
+        snapshot = {}
+        for key, value in meta.items():
+            if key in ARRAY_LIST_KEYS:
+                snapshot[key] = [data[f"{key}/{i:03d}"] for i in range(value)]
+            elif isinstance(value, dict):
+                prefix = f"{key}/"
+                snapshot[key] = dict(value, **{name[len(prefix):]: data[name] for name in data.files if name.startswith(prefix)})
+            else:
+                snapshot[key] = value
+        for name in data.files:
+            if '/' not in name and name != 'meta':
+                snapshot[name] = data[name]
+    return snapshot
+
+
+class AsyncCheckpointer:
+    def __init__(self, checkpoint_path, every_episodes=10, every_seconds=300.0, keep_last=3):
+        """
+        Saves training snapshots on a background thread so training never waits on disk I/O.
+
+        A snapshot (weights, target weights, optimizer state, exploration rate, replay buffer and RNG
+        state) is copied in memory on the training thread, then written by a writer thread as
+        '<name>.ckpt-<episode>.npz' next to checkpoint_path. Only the newest keep_last snapshots are kept.
+        If a write is still running when the next snapshot is due, the pending snapshot is replaced by the
+        newer one instead of queueing up.
+
+        Parameters:
+        - checkpoint_path (str): The model's '.weights.h5' path; snapshots are written alongside it.
+        - every_episodes (int): Save after this many episodes since the last snapshot (None to disable).
+        - every_seconds (float): Save once this much time has passed since the last snapshot (None to disable).
+        - keep_last (int): Number of snapshots kept on disk (at least 1).
+        """
+        self.checkpoint_path = checkpoint_path
+        self.every_episodes = every_episodes
+        self.every_seconds = every_seconds
+        self.keep_last = max(int(keep_last), 1)
+        self.last_episode = 0
+        self.last_time = time.monotonic()
+        self._pending = None
+        self._writing = False
+        self._condition = threading.Condition()
+        self._writer = None
+
+    def due(self, episode):
+        if self.every_episodes is not None and episode - self.last_episode >= self.every_episodes:
+            return True
+        return self.every_seconds is not None and time.monotonic() - self.last_time >= self.every_seconds
+
+    def maybe_save(self, detector, episode):
+        # Called by the training loops after each episode; snapshots only when one is due
+        if self.due(episode):
+            self.save(detector, episode)
+
+    def save(self, detector, episode):
+        """Snapshots the detector's training state now and hands it to the writer thread."""
+        snapshot = detector.training_state()
+        self.last_episode = episode
+        self.last_time = time.monotonic()
+        with self._condition:
+            if self._writer is None or not self._writer.is_alive():
+                self._writer = threading.Thread(target=self._run, name="checkpoint-writer", daemon=True)
+                self._writer.start()
+            self._pending = (episode, snapshot)
+            self._condition.notify_all()
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while self._pending is None:
+                    self._condition.wait()
+                episode, snapshot = self._pending
+                self._pending = None
+                self._writing = True
+            try:
+                self._write(episode, snapshot)
+            except Exception as e:
+                print(f"Error writing checkpoint for episode {episode}: {e}")
+            with self._condition:
+                self._writing = False
+                self._condition.notify_all()
+
+    def _write(self, episode, snapshot):
+        directory = os.path.dirname(self.checkpoint_path)
+        os.makedirs(directory or ".", exist_ok=True)
+        stem = os.path.basename(self.checkpoint_path).split('.')[0]
+        write_snapshot(snapshot, os.path.join(directory, f"{stem}.ckpt-{episode:06d}.npz"))
+        for old_path in snapshot_paths(self.checkpoint_path)[:-self.keep_last]:
+            os.remove(old_path)
+
+    def wait(self):
+        """Blocks until every snapshot handed to the writer is on disk."""
+        with self._condition:
+            while self._pending is not None or self._writing:
+                self._condition.wait()
+
+    def finish(self, detector, episode):
+        """
+        Ends a training run: writes a last snapshot and replaces the '.weights.h5' checkpoint atomically.
+
+        Parameters:
+        - detector (DeepDynamicCollisionDetection): The detector being trained.
+        - episode (int): Number of episodes completed.
+        """
+        if episode != self.last_episode:
+            self.save(detector, episode)
+        self.wait()
+        # Keras only writes files ending in '.weights.h5', so the temporary name keeps that suffix
+        temp_path = self.checkpoint_path.replace(".weights.h5", f".{os.getpid()}.tmp.weights.h5")
+        os.makedirs(os.path.dirname(self.checkpoint_path) or ".", exist_ok=True)
+        detector.model.save_weights(temp_path)
+        os.replace(temp_path, self.checkpoint_path)
+
+    def restore(self, detector, path=None):
+        """
+        Restores the detector from a snapshot so training continues where it stopped.
+
+        Parameters:
+        - detector (DeepDynamicCollisionDetection): The detector to restore into.
+        - path (str): Snapshot to load; defaults to the newest one next to checkpoint_path.
+
+        Returns:
+        - int or None: The restored episode count, or None if there is no snapshot.
+        """
+        path = path or latest_snapshot(self.checkpoint_path)
+        if path is None:
+            return None
+        snapshot = read_snapshot(path)
+        detector.load_training_state(snapshot)
+        self.last_episode = snapshot['episodes_completed']
+        self.last_time = time.monotonic()
+        print(f"Resumed training state from {path} (episode {self.last_episode}).")
+        return self.last_episode
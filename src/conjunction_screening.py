@@ -0,0 +1,189 @@
+import numpy as np
+from catalog_propagator import CatalogPropagator
+from trajectory_equations import CompiledTrajectory
+from tle_store import load_tle_catalog
+
+
+class ConjunctionScreener:
+    def __init__(self, trajectory_equation, tle_data, screening_distance=1.0, max_block_elements=2000000):
+        """
+        Screens a rocket trajectory against a TLE catalog for close approaches in continuous time.
+
+        Works in the same position model as CatalogPropagator.positions: object i moves on a circle of
+        radius |inclination| around the z-axis with |z| <= eccentricity. Screening runs in three stages:
+        1. Shell/geometry prefilter: objects whose cylinder radius or z band never comes within the
+           screening distance of the rocket over the window are rejected without being propagated.
+        2. Coarse sweep: the window is split into a grid fine enough for the fastest survivor. The same shell
+           test is repeated per grid interval, so each object is only propagated over the few intervals in
+           which the rocket crosses its shell; intervals where the range rate changes sign from closing to
+           opening (a local minimum of the distance) are kept if a speed bound says the minimum could be
+           within the screening distance.
+        3. Refinement: the time of closest approach (TCA) in every kept interval is found by vectorized
+           bisection on the range rate, and the miss distance is evaluated there.
+
+        Parameters:
+        - trajectory_equation (dict): x/y/z equations as returned by TrajectoryCalculator.calculate_trajectory.
+        - tle_data (pd.DataFrame, str or CatalogPropagator): The loaded catalog, a CSV/binary store path,
+          or an existing propagator (e.g. a detector's prefiltered subset).
+        - screening_distance (float): Miss distance below which an approach is reported.
+        - max_block_elements (int): Upper bound on time samples x objects evaluated at once in the sweep.
+        """
+        self.trajectory = CompiledTrajectory(trajectory_equation)
+        if isinstance(tle_data, CatalogPropagator):
+            self.propagator = tle_data
+        else:
+            self.propagator = CatalogPropagator(load_tle_catalog(tle_data) if isinstance(tle_data, str) else tle_data)
+        self.screening_distance = screening_distance
+        self.max_block_elements = max_block_elements
+        self.stats = {}
+
+    def _rocket_state(self, t):
+        # Rocket positions and (central-difference) velocities at times t, as (T, 3) arrays
+        t = np.asarray(t, dtype=np.float64)
+        h = 1e-6 * np.maximum(1.0, np.abs(t))
+        positions = self.trajectory(t)
+        velocities = (self.trajectory(t + h) - self.trajectory(t - h)) / (2 * h)[..., np.newaxis]
+        if np.isnan(positions).any():
+            raise ValueError("The trajectory equations could not be evaluated over the screening window.")
+        return positions, velocities
+
+    def _object_state(self, indices, t):
+        # Object positions and analytic velocities; indices and t broadcast against each other
+        inclination = self.propagator.inclination[indices]
+        eccentricity = self.propagator.eccentricity[indices]
+        mean_motion = self.propagator.mean_motion[indices]
+        phase = mean_motion * t
+        angle = self.propagator.raan[indices] + phase
+        cos_angle, sin_angle = np.cos(angle), np.sin(angle)
+
+        positions = np.stack([inclination * cos_angle, inclination * sin_angle, eccentricity * np.sin(phase)], axis=-1)
+        velocities = np.stack([-inclination * mean_motion * sin_angle, inclination * mean_motion * cos_angle,
+                               eccentricity * mean_motion * np.cos(phase)], axis=-1)
+        return positions, velocities
+
+    def prefilter(self, t_start, t_stop, samples=1001):
+        """
+        Rejects objects whose orbit shell or z band never comes within the screening distance.
+
+        The distance from the rocket to object i is at least the gap between their distances from the
+        z-axis, and at least the gap between the rocket's z and the object's band [-e, e]. The rocket's
+        range of both is sampled and padded by the largest change between samples.
+
+        Returns:
+        - np.ndarray: Indices (into the propagator) of the objects that may come close.
+        """
+        positions, _ = self._rocket_state(np.linspace(t_start, t_stop, samples))
+        radius = np.hypot(positions[:, 0], positions[:, 1])
+        z = positions[:, 2]
+        pad = max(np.abs(np.diff(radius)).max(initial=0.0), np.abs(np.diff(z)).max(initial=0.0))
+        reach = self.screening_distance + pad
+
+        shell = np.abs(self.propagator.inclination)
+        band = np.abs(self.propagator.eccentricity)
+        keep = (shell >= radius.min() - reach) & (shell <= radius.max() + reach)
+        keep &= (z.min() - reach <= band) & (z.max() + reach >= -band)
+        return np.flatnonzero(keep)
+
+    def screen(self, t_start=0.0, t_stop=100.0, coarse_step=None, iterations=50):
+        """
+        Finds every approach closer than the screening distance in [t_start, t_stop].
+
+        Parameters:
+        - t_start (float): Start of the screening window.
+        - t_stop (float): End of the screening window.
+        - coarse_step (float): Sweep spacing; by default an eighth of a revolution of the fastest candidate.
+        - iterations (int): Bisection steps used to refine each time of closest approach.
+
+        Returns:
+        - list: One dict per conjunction with 'satellite_id', 'tca', 'miss_distance', 'relative_speed',
+          'rocket_position' and 'object_position', ranked by miss distance (closest first).
+        """
+        candidates = self.prefilter(t_start, t_stop)
+        self.stats = {'catalog': len(self.propagator), 'after_prefilter': len(candidates), 'intervals': 0, 'conjunctions': 0}
+        if not len(candidates):
+            return []
+
+        if coarse_step is None:
+            fastest = np.abs(self.propagator.mean_motion[candidates]).max()
+            coarse_step = min((t_stop - t_start) / 100.0, np.pi / 4 / fastest if fastest > 0 else np.inf)
+        times = np.linspace(t_start, t_stop, max(int(np.ceil((t_stop - t_start) / coarse_step)) + 1, 2))
+        step = times[1] - times[0]
+        rocket_positions, rocket_velocities = self._rocket_state(times)
+        rocket_speed = np.linalg.norm(rocket_velocities, axis=1).max()
+
+        # Range of the rocket's distance from the z-axis and of its z over each grid interval
+        radius = np.hypot(rocket_positions[:, 0], rocket_positions[:, 1])
+        z = rocket_positions[:, 2]
+        pad = rocket_speed * step / 2 + self.screening_distance
+        radius_low = np.minimum(radius[:-1], radius[1:])[:, np.newaxis] - pad
+        radius_high = np.maximum(radius[:-1], radius[1:])[:, np.newaxis] + pad
+        z_low = np.minimum(z[:-1], z[1:])[:, np.newaxis] - pad
+        z_high = np.maximum(z[:-1], z[1:])[:, np.newaxis] + pad
+
+        # Sweep blocks of objects, collecting brackets [a, b] around possible minima
+        lower, upper, objects = [], [], []
+        block = max(1, self.max_block_elements // len(times))
+        for start in range(0, len(candidates), block):
+            indices = candidates[start:start + block]
+            shell = np.abs(self.propagator.inclination[indices])
+            band = np.abs(self.propagator.eccentricity[indices])
+
+            # Shell test per interval: only intervals in which the rocket can reach the object's orbit are propagated
+            near = (shell >= radius_low) & (shell <= radius_high) & (band >= z_low) & (-band <= z_high)
+            k, b = np.nonzero(near)
+            obj = indices[b]
+            positions, velocities = self._object_state(obj[:, np.newaxis], times[np.stack([k, k + 1], axis=1)])
+            relative = rocket_positions[np.stack([k, k + 1], axis=1)] - positions
+            distance = np.linalg.norm(relative, axis=2)
+            range_rate = np.einsum('mek,mek->me', relative, rocket_velocities[np.stack([k, k + 1], axis=1)] - velocities)
+
+            # Bound on how fast the distance can change, per object
+            speed = rocket_speed + np.abs(self.propagator.mean_motion[obj]) * np.hypot(
+                self.propagator.inclination[obj], self.propagator.eccentricity[obj])
+
+            # Closing at k, opening at k + 1: a minimum lies inside, no lower than this bound
+            closing = (range_rate[:, 0] < 0) & (range_rate[:, 1] >= 0)
+            closing &= (distance[:, 0] + distance[:, 1] - speed * step) / 2 <= self.screening_distance
+            lower.append(times[k[closing]])
+            upper.append(times[k[closing] + 1])
+            objects.append(obj[closing])
+
+            # Minima at the window edges: already opening at the start, or still closing at the end
+            for edge, mask in ((0, (k == 0) & (range_rate[:, 0] >= 0)), (1, (k == len(times) - 2) & (range_rate[:, 1] < 0))):
+                mask &= distance[:, edge] <= self.screening_distance
+                lower.append(times[k[mask] + edge])
+                upper.append(times[k[mask] + edge])
+                objects.append(obj[mask])
+
+        a, b, objects = np.concatenate(lower), np.concatenate(upper), np.concatenate(objects)
+        self.stats['intervals'] = len(objects)
+
+        # Vectorized bisection for the zero of the range rate inside each bracket
+        for _ in range(iterations):
+            middle = (a + b) / 2
+            rocket_position, rocket_velocity = self._rocket_state(middle)
+            position, velocity = self._object_state(objects, middle)
+            opening = np.einsum('mk,mk->m', rocket_position - position, rocket_velocity - velocity) >= 0
+            b = np.where(opening, middle, b)
+            a = np.where(opening, a, middle)
+
+        tca = (a + b) / 2
+        rocket_position, rocket_velocity = self._rocket_state(tca)
+        position, velocity = self._object_state(objects, tca)
+        miss = np.linalg.norm(rocket_position - position, axis=1)
+        relative_speed = np.linalg.norm(rocket_velocity - velocity, axis=1)
+
+        conjunctions = []
+        for i in np.argsort(miss, kind='stable'):
+            if miss[i] > self.screening_distance:
+                break
+            conjunctions.append({
+                'satellite_id': self.propagator.satellite_ids[objects[i]],
+                'tca': float(tca[i]),
+                'miss_distance': float(miss[i]),
+                'relative_speed': float(relative_speed[i]),
+                'rocket_position': rocket_position[i].tolist(),
+                'object_position': position[i].tolist(),
+            })
+        self.stats['conjunctions'] = len(conjunctions)
+        return conjunctions
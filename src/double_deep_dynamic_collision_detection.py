@@ -1,18 +1,26 @@
 import numpy as np
-import math
-import pandas as pd
 import random
-from collections import deque
-import tensorflow as tf
-from tensorflow.keras import layers, optimizers
-from sklearn.metrics import f1_score, accuracy_score, precision_score, recall_score
-import matplotlib.pyplot as plt
 import os
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from catalog_propagator import CatalogPropagator
+from spatial_index import SpatialIndex
+from trajectory_equations import CompiledTrajectory
+from replay_buffer import ReplayBuffer, PrioritizedReplayBuffer
+from parallel_training import run_actor_episodes
+from numpy_q_network import NumpyQNetwork
+from ephemeris_cache import EphemerisCache
+from checkpointing import AsyncCheckpointer
+from instrumentation import PhaseTimer, NullTimer
+from streaming_metrics import TrainingMetrics
+from tle_store import load_tle_catalog, merge_tle_catalog
 
 class DeepDynamicCollisionDetection:
-    def __init__(self, trajectory_equation, rocket_type, launch_sites, launch_coordinates, altitude, altitude_range, orbit_type, time_selected, tle_data, learning_rate=0.0003, discount_factor=0.99, exploration_rate=1.0, exploration_decay=0.995, state_size=3, action_size=10):
+    def __init__(self, trajectory_equation, rocket_type, launch_sites, launch_coordinates, altitude, altitude_range, orbit_type, time_selected, tle_data, learning_rate=0.0003, discount_factor=0.99, exploration_rate=1.0, exploration_decay=0.995, state_size=3, action_size=10, collision_threshold=1.0, index_cache_size=1024, index_cache_bytes=256 * 2 ** 20, replay_capacity=15000, prioritized_replay=False, priority_alpha=0.6, priority_beta=0.4, inference_only=False, compiled_train_step=False, checkpoint_every_episodes=10, checkpoint_every_seconds=300.0, keep_checkpoints=3, verbosity=1, profile=False, profile_path=None, rolling_episodes=None, rolling_steps=None, shell_margin=100.0):
         # Initialization
         self.trajectory_equation = trajectory_equation
+        self._compiled_trajectory = None  # Compiled x/y/z equations, see compiled_trajectory()
         self.rocket_type = rocket_type
         self.launch_sites = launch_sites
         self.launch_coordinates = launch_coordinates
@@ -20,36 +28,73 @@ class DeepDynamicCollisionDetection:
         self.altitude_range = altitude_range
         self.orbit_type = orbit_type
         self.time_selected = time_selected
-        self.tle_data = pd.read_csv(tle_data) if isinstance(tle_data, str) else tle_data  # Ensure tle_data is a DataFrame
+        self.tle_data = load_tle_catalog(tle_data) if isinstance(tle_data, str) else tle_data  # Ensure tle_data is a DataFrame (CSV or binary store path)
+        self.verbosity = verbosity  # 0: errors only, 1: progress per episode, 2: per-step debug output
+        self.shell_margin = shell_margin  # km around altitude_range; None propagates the whole catalog
+        # Orbital elements as contiguous columns for vectorized propagation, restricted to the mission's altitude shell
+        self.propagator = self._mission_shell(CatalogPropagator(self.tle_data))
+        self.collision_threshold = collision_threshold
+        self.index_cache_size = index_cache_size
+        self.index_cache_bytes = index_cache_bytes  # Indexes hold a few arrays per object, so the cache is also capped by size
+        self._index_cache = {}  # Spatial index per time step, reused across episodes
+        self._index_cache_nbytes = 0
+        self._catalog_lock = threading.Lock()  # Catalog updates may arrive from a TLEFileFollower thread
+        self.ephemeris = None  # Precomputed catalog positions, see precompute_ephemeris()
         self.learning_rate = learning_rate
         self.discount_factor = discount_factor
         self.exploration_rate = exploration_rate
         self.exploration_decay = exploration_decay
         self.state_size = state_size
         self.action_size = action_size
-        self.memory = deque(maxlen=15000)  # Increased replay memory to store more diverse experiences
+        self.prioritized_replay = prioritized_replay
+        if prioritized_replay:
+            # Sum-tree backed memory that replays rare, high TD-error transitions (collisions) more often
+            self.memory = PrioritizedReplayBuffer(capacity=replay_capacity, state_size=state_size, alpha=priority_alpha, beta=priority_beta)
+        else:
+            self.memory = ReplayBuffer(capacity=replay_capacity, state_size=state_size)  # Preallocated ring buffer of transitions
+        self.compiled_train_step = compiled_train_step  # Replay through one traced graph call instead of predict/fit
+        self._train_step = None  # Built on first replay, see _build_train_step()
         self.actions = [(0, 0), (10, 0), (0, 10), (-10, 0), (5, 5), (-5, -5), (10, 10), (-10, -10), (15, 0), (0, 15)]  # Action space
-        self.model = self._build_model()
-        self.target_model = self._build_model()  # Target network for stable learning
-        self.update_target_model()  # Initialize target model with the same weights as the model
         self.x_cumulative_adjust = 0
         self.y_cumulative_adjust = 0
-        self.episode_rewards = []
-        self.collision_avoided = []
-        self.true_labels = []
-        self.predicted_labels = []
+        self.metrics = TrainingMetrics()  # Running reward means and confusion counts for evaluate_model
+        # Optional metrics over the most recent episodes/steps only, for monitoring trends during long runs
+        self.rolling_metrics = TrainingMetrics(rolling_episodes, rolling_steps) if rolling_episodes or rolling_steps else None
         self.collision_data = []  # Track collision events
+        self.episodes_completed = 0  # Across train calls and resumed runs; drives the target update schedule
+        # Per-phase timings (histograms, optional JSON lines per episode); a no-op timer unless profiling
+        self.timer = PhaseTimer(profile_path) if profile or profile_path else NullTimer()
         self.checkpoint_path = "/Users/thrishankkuntimaddi/Documents/Final_Year_Project/Space-Debris-and-Route-Calculation/checkpoints/deep_dynamic_collision_detection.weights.h5"  # Path to save checkpoints
 
-        # Load model weights if available
-        if os.path.exists(self.checkpoint_path):
-            self.model.load_weights(self.checkpoint_path)
-            print("Checkpoint loaded successfully. Using existing model for predictions.")
+        self.inference_only = inference_only
+        if inference_only:
+            # NumPy forward pass over the checkpoint's weights; TensorFlow is never imported
+            if not os.path.exists(self.checkpoint_path):
+                raise FileNotFoundError(f"Inference-only mode needs a trained checkpoint at {self.checkpoint_path}")
+            self.model = NumpyQNetwork.from_checkpoint(self.checkpoint_path)
+            self.target_model = None
+            self.checkpointer = None
+            print("Checkpoint loaded successfully. Using NumPy inference for predictions.")
         else:
-            print("No checkpoint found, training from scratch.")
+            self.model = self._build_model()
+            self.target_model = self._build_model()  # Target network for stable learning
+            self.update_target_model()  # Initialize target model with the same weights as the model
+            # Training snapshots are written on a background thread, see checkpointing.AsyncCheckpointer
+            self.checkpointer = AsyncCheckpointer(self.checkpoint_path, every_episodes=checkpoint_every_episodes,
+                                                  every_seconds=checkpoint_every_seconds, keep_last=keep_checkpoints)
+
+            # Load model weights if available
+            if os.path.exists(self.checkpoint_path):
+                self.model.load_weights(self.checkpoint_path)
+                print("Checkpoint loaded successfully. Using existing model for predictions.")
+            else:
+                print("No checkpoint found, training from scratch.")
 
     def _build_model(self):
         # Improved neural network for Deep Q-Learning
+        import tensorflow as tf  # Imported on first use so inference-only runs never load TensorFlow
+        from tensorflow.keras import layers, optimizers
+
         model = tf.keras.Sequential()
         model.add(layers.Input(shape=(self.state_size,)))
         model.add(layers.Dense(512, activation='relu'))  # Increased neurons for deeper learning
@@ -60,134 +105,493 @@ class DeepDynamicCollisionDetection:
         model.compile(loss='mse', optimizer=optimizers.Adam(learning_rate=self.learning_rate))
         return model
 
+    def _build_train_step(self):
+        # Traced training step: target computation, loss and optimizer update in one graph call per minibatch
+        # Same update as the predict/fit path in replay(): MSE over all actions with only the taken action's
+        # target replaced, dropout active, and optional importance-sampling weights
+        import tensorflow as tf
+
+        model, target_model, optimizer = self.model, self.target_model, self.model.optimizer
+        if not optimizer.built:
+            optimizer.build(model.trainable_variables)  # Create slot variables outside the traced function
+        discount_factor = tf.constant(self.discount_factor, dtype=tf.float32)
+
+        @tf.function(reduce_retracing=True)
+        def train_step(states, actions, rewards, next_states, dones, weights):
+            next_q_values = target_model(next_states, training=False)
+            targets = rewards + tf.where(dones, 0.0, discount_factor * tf.reduce_max(next_q_values, axis=1))
+            taken = tf.stack([tf.range(tf.shape(actions)[0]), actions], axis=1)
+            q_values = model(states, training=False)
+            target_f = tf.tensor_scatter_nd_update(q_values, taken, targets)
+
+            with tf.GradientTape() as tape:
+                predictions = model(states, training=True)
+                loss = tf.reduce_mean(weights * tf.reduce_mean(tf.square(target_f - predictions), axis=1))
+            gradients = tape.gradient(loss, model.trainable_variables)
+            optimizer.apply_gradients(zip(gradients, model.trainable_variables))
+            return targets, targets - tf.gather_nd(q_values, taken)
+
+        return train_step
+
+    def _require_training_model(self):
+        if self.inference_only:
+            raise RuntimeError("This detector was created with inference_only=True; create it without it to train.")
+
     def update_target_model(self):
         # Update target model with weights from the main model
         self.target_model.set_weights(self.model.get_weights())
 
+    def training_state(self):
+        # In-memory copy of everything needed to continue training exactly where it stopped
+        optimizer = getattr(self.model, 'optimizer', None)
+        numpy_random = np.random.get_state()
+        return {
+            'episodes_completed': self.episodes_completed,
+            'exploration_rate': self.exploration_rate,
+            'x_cumulative_adjust': self.x_cumulative_adjust,
+            'y_cumulative_adjust': self.y_cumulative_adjust,
+            'model': self.model.get_weights(),
+            'target_model': self.target_model.get_weights(),
+            'optimizer': [variable.numpy() for variable in optimizer.variables] if optimizer is not None and optimizer.built else [],
+            'memory': self.memory.state_dict(),
+            'metrics': self.metrics.state_dict(),
+            'rolling_metrics': self.rolling_metrics.state_dict() if self.rolling_metrics is not None else None,
+            'collision_data': [list(entry) for entry in self.collision_data],
+            'python_random': random.getstate(),
+            'numpy_random_keys': numpy_random[1].copy(),
+            'numpy_random': list(numpy_random[2:]),
+        }
+
+    def load_training_state(self, state):
+        # Restore a snapshot from training_state() (or read back from disk by the checkpointer)
+        self._require_training_model()
+        self.episodes_completed = int(state['episodes_completed'])
+        self.exploration_rate = float(state['exploration_rate'])
+        self.x_cumulative_adjust = state['x_cumulative_adjust']
+        self.y_cumulative_adjust = state['y_cumulative_adjust']
+        self.model.set_weights(state['model'])
+        self.target_model.set_weights(state['target_model'])
+        if len(state['optimizer']):
+            optimizer = self.model.optimizer
+            if not optimizer.built:
+                optimizer.build(self.model.trainable_variables)
+            for variable, value in zip(optimizer.variables, state['optimizer']):
+                variable.assign(value)
+        self.memory.load_state_dict(state['memory'])
+        self.metrics.load_state_dict(state['metrics'])
+        if self.rolling_metrics is not None and state.get('rolling_metrics') is not None:
+            self.rolling_metrics.load_state_dict(state['rolling_metrics'])
+        self.collision_data = [tuple(entry) for entry in state['collision_data']]
+        version, internal, gauss = state['python_random']
+        random.setstate((version, tuple(internal), gauss))
+        np.random.set_state(('MT19937', state['numpy_random_keys'], *state['numpy_random']))
+
+    def resume_training(self, snapshot_path=None):
+        # Continue from the newest training snapshot (or the given one); returns the episode count or None
+        self._require_training_model()
+        return self.checkpointer.restore(self, snapshot_path)
+
+    def _record_step(self, true_label, predicted_label):
+        self.metrics.record_step(true_label, predicted_label)
+        if self.rolling_metrics is not None:
+            self.rolling_metrics.record_step(true_label, predicted_label)
+
+    def _record_steps(self, true_labels, predicted_labels):
+        self.metrics.record_steps(true_labels, predicted_labels)
+        if self.rolling_metrics is not None:
+            self.rolling_metrics.record_steps(true_labels, predicted_labels)
+
+    def _record_episode(self, total_reward, collision_avoidance_rate):
+        self.metrics.record_episode(total_reward, collision_avoidance_rate)
+        if self.rolling_metrics is not None:
+            self.rolling_metrics.record_episode(total_reward, collision_avoidance_rate)
+
+    def compiled_trajectory(self):
+        # Compile the trajectory equations once; recompile only if the strings changed (e.g. after optimize_trajectory)
+        source = tuple(self.trajectory_equation[axis] for axis in ('x', 'y', 'z'))
+        if self._compiled_trajectory is None or self._compiled_trajectory.source != source:
+            self._compiled_trajectory = CompiledTrajectory(self.trajectory_equation)
+        return self._compiled_trajectory
+
     def rocket_position(self, t):
         # Calculate the rocket's position using the given trajectory equations
+        # Returns a (3,) position for a scalar t, or a (T, 3) array for a vector of times
         try:
-            x = eval(self.trajectory_equation['x'].replace('x(t) = ', '').replace('t', f'({t})'), {'cos': math.cos, 'sin': math.sin, 'exp': math.exp})
-            y = eval(self.trajectory_equation['y'].replace('y(t) = ', '').replace('t', f'({t})'), {'cos': math.cos, 'sin': math.sin, 'exp': math.exp})
-            z = eval(self.trajectory_equation['z'].replace('z(t) = ', '').replace('t', f'({t})'), {'cos': math.cos, 'sin': math.sin, 'exp': math.exp})
-            return np.array([x, y, z])
+            with self.timer.phase('trajectory'):
+                return self.compiled_trajectory()(t)
         except Exception as e:
             print(f"Error calculating rocket position: {e}")
-            return np.array([np.nan, np.nan, np.nan])
+            return np.full(np.shape(t) + (3,), np.nan)
 
     def satellite_positions(self, t):
         # Calculate satellite positions based on TLE data and time t
-        positions = []
-        for _, row in self.tle_data.iterrows():
-            try:
-                inclination = row['Inclination_deg']
-                raan = row['RAAN_deg']
-                eccentricity = row['Eccentricity'] * 1e-7
-                mean_motion = row['Mean_Motion']
-                # Simple approximation for satellite position based on mean motion and time t
-                x = inclination * math.cos(raan + mean_motion * t)
-                y = inclination * math.sin(raan + mean_motion * t)
-                z = eccentricity * math.sin(mean_motion * t)
-                positions.append(np.array([x, y, z]))  # Updated to reflect changing positions over time
-            except Exception as e:
-                print(f"Error calculating satellite position: {e}")
-        return positions
+        # Returns an (N, 3) array for a scalar t, or a (T, N, 3) array for a vector of times
+        with self.timer.phase('propagation'):
+            if self.ephemeris is not None:
+                positions = self.ephemeris.lookup(t)
+                if positions is not None:
+                    return positions
+            return self.propagator.positions(t)
+
+    def precompute_ephemeris(self, t_start=0, t_stop=100, step=1.0, cache_dir=None):
+        # Precompute catalog positions over a time grid into a memory-mapped file keyed by catalog content and grid
+        # Later runs (and actor processes) against the same catalog reuse the file instead of propagating again
+        if cache_dir is None:
+            cache_dir = os.path.join(os.path.dirname(os.path.dirname(self.checkpoint_path)), "ephemeris")
+        self.ephemeris = EphemerisCache(self.propagator, t_start, t_stop, step=step, cache_dir=cache_dir)
+        print(f"Ephemeris cache ready: {self.ephemeris.path}")
+        return self.ephemeris
+
+    def _mission_shell(self, propagator):
+        # Keep only objects whose perigee-apogee shell overlaps the mission's altitude band, widened by shell_margin
+        # Everything downstream (propagation, spatial indexes, ephemeris, actors) works on this subset, while
+        # tle_data keeps the full catalog so updates can still be merged into it
+        band = self.altitude_range if self.altitude_range is not None else [self.altitude, self.altitude]
+        if self.shell_margin is None or band is None or any(edge is None for edge in band):
+            return propagator
+        low, high = min(band), max(band)
+        subset = propagator.take(propagator.within_altitude_band(low, high, self.shell_margin))
+        if self.verbosity >= 1:
+            print(f"Altitude shell prefilter: {len(subset)} of {len(propagator)} objects overlap {low:g}-{high:g} km "
+                  f"(margin {self.shell_margin:g} km)")
+        return subset
+
+    def update_catalog(self, tle_data, changed_ids=None):
+        # Swap in an updated catalog without restarting
+        # Spatial indexes are rebuilt lazily; the ephemeris cache recomputes only the objects in changed_ids
+        # (all objects when changed_ids is None)
+        propagator = self._mission_shell(CatalogPropagator(tle_data))
+        ephemeris = self.ephemeris
+        if ephemeris is not None:
+            if changed_ids is None:
+                changed_ids = propagator.satellite_ids
+            ephemeris = ephemeris.updated(propagator, self.propagator, changed_ids)
+
+        # Swap everything together so collision checks never mix old and new catalogs
+        with self._catalog_lock:
+            previous_ephemeris = self.ephemeris
+            self.tle_data = tle_data
+            self.propagator = propagator
+            self.ephemeris = ephemeris
+            self._index_cache = {}
+            self._index_cache_nbytes = 0
+
+        # The previous ephemeris file is superseded; keep only the current one on disk
+        if previous_ephemeris is not None and previous_ephemeris.path != ephemeris.path:
+            previous_ephemeris.discard()
+
+    def apply_catalog_update(self, new_tle_data):
+        # Merge a batch of new TLEs into the in-process catalog (newest epoch per Satellite_Num) and report the changes
+        merged, report = merge_tle_catalog(self.tle_data, new_tle_data)
+        if len(report['changed']):
+            self.update_catalog(merged, report['changed'])
+        if self.verbosity >= 1:
+            print(f"Catalog update: {len(report['added'])} added, {len(report['updated'])} updated, {report['unchanged']} unchanged")
+        return report
+
+    def spatial_index(self, t):
+        # Hash grid over the catalog positions at time t, built once per time step and cached
+        index = self._index_cache.get(t)
+        if index is None:
+            with self._catalog_lock:
+                if t in self._index_cache:
+                    return self._index_cache[t]  # Built by another thread while this one waited for the lock
+                index = SpatialIndex(self.satellite_positions(t), ids=self.propagator.satellite_ids, cell_size=self.collision_threshold)
+                # Evict the oldest time steps until the new index fits; the newest one is always kept
+                while self._index_cache and (len(self._index_cache) >= self.index_cache_size
+                                             or self._index_cache_nbytes + index.nbytes > self.index_cache_bytes):
+                    self._index_cache_nbytes -= self._index_cache.pop(next(iter(self._index_cache))).nbytes
+                self._index_cache[t] = index
+                self._index_cache_nbytes += index.nbytes
+        return index
+
+    def closest_object(self, rocket_position, t, threshold=None):
+        # Nearest catalog object within threshold of the rocket at time t, as (distance, satellite id)
+        # Returns (inf, None) when nothing is within threshold
+        threshold = self.collision_threshold if threshold is None else threshold
+        with self.timer.phase('collision_check'):
+            return self.spatial_index(t).nearest_within(rocket_position, threshold)
+
+    def nearest_objects(self, rocket_position, t, k=5):
+        # The k catalog objects closest to the rocket at time t, as (distances, satellite ids)
+        return self.spatial_index(t).k_nearest(rocket_position, k)
 
     @staticmethod
     def detect_collision(rocket_position, satellite_positions, threshold=1.0):
         # Detect collision by calculating distances
-        for sat_pos in satellite_positions:
-            distance = np.linalg.norm(rocket_position - sat_pos)
-            if distance < threshold:
-                return True  # Collision detected
-        return False
+        # satellite_positions may be a SpatialIndex (sub-linear lookup) or an (N, 3) array of positions
+        if isinstance(satellite_positions, SpatialIndex):
+            return satellite_positions.any_within(rocket_position, threshold)
+        satellite_positions = np.asarray(satellite_positions).reshape(-1, 3)
+        return bool(np.any(np.linalg.norm(satellite_positions - rocket_position, axis=1) < threshold))
 
     def get_state(self, t):
         # Generate a simplified state representation based on the rocket's position at time t
         rocket_pos = self.rocket_position(t)
-        print(f"Debug: Rocket position at time {t}: {rocket_pos}")  # Debug statement for rocket position
+        if self.verbosity >= 2:
+            print(f"Debug: Rocket position at time {t}: {rocket_pos}")  # Debug statement for rocket position
         return np.zeros(self.state_size) if np.any(np.isnan(rocket_pos)) else np.round(rocket_pos, 2)
 
-    def train(self, num_episodes=None, max_steps=None):
+    def get_states(self, times):
+        # Vectorized get_state: one (state_size,) row per time, from a single trajectory evaluation
+        rocket_pos = np.atleast_2d(self.rocket_position(np.asarray(times, dtype=np.float64).ravel()))
+        return np.where(np.isnan(rocket_pos).any(axis=1, keepdims=True), 0.0, np.round(rocket_pos, 2))
+
+    def train(self, num_episodes=None, max_steps=None, num_envs=1):
         if num_episodes is None:
             num_episodes = int(input("Enter total number of episodes: "))
         if max_steps is None:
             max_steps = int(input("Enter max_steps: "))
+        self._require_training_model()
+        if num_envs > 1:
+            return self.train_vectorized(num_episodes, max_steps, num_envs)
+
+        try:
+            # Train the model using Deep Q-learning with Double DQN and Target Network
+            for episode in range(num_episodes):
+                state = self.get_state(0)  # Initial state
+                total_reward = 0
+                collisions_avoided = 0
+                collision_count = 0  # Counter to track collisions per episode
+
+                for t in range(1, max_steps):
+                    # Choose action: exploration or exploitation
+                    with self.timer.phase('action_selection'):
+                        if random.uniform(0, 1) < self.exploration_rate:
+                            action = random.randrange(self.action_size)
+                        else:
+                            q_values = self.model.predict(state[np.newaxis, :], verbose=0)
+                            if self.verbosity >= 2:
+                                print(f"Debug: Q-values for state {state}: {q_values}")  # Debug statement for Q-values
+                            action = np.argmax(q_values[0])
+
+                    # Apply action and calculate new state
+                    t_adjust, y_adjust = self.actions[action]
+                    if self.verbosity >= 2:
+                        print(f"Debug: Action taken: {action}, t_adjust: {t_adjust}, y_adjust: {y_adjust}")  # Debug statement for action
+                    self.x_cumulative_adjust += t_adjust
+                    self.y_cumulative_adjust += y_adjust
+                    new_state = self.get_state(t)
+
+                    # Calculate reward
+                    rocket_pos = self.rocket_position(t)
+                    distance, satellite_id = self.closest_object(rocket_pos, t)
+                    if distance < self.collision_threshold:
+                        reward = random.randint(-250, -150)  # Increased penalty for collision with variability to enhance class diversity
+                        done = True
+                        collision_count += 1  # Increment collision counter
+                        self.collision_data.append((t, rocket_pos.tolist(), satellite_id, float(distance)))  # Log collision data with the object hit
+                    else:
+                        reward = random.randint(10, 30)  # Increased and variable reward for safe trajectory to enhance diversity
+                        done = False
+
+                    # Store experience in replay memory
+                    self.memory.append((state, action, reward, new_state, done))
+
+                    # Train the model using replay
+                    if len(self.memory) > 64:
+                        self.replay(64)
+
+                    state = new_state
+                    total_reward += reward
+
+                    # Track if collision was avoided
+                    if reward > 0:
+                        collisions_avoided += 1
+                        self._record_step(1, 1 if action != 0 else 0)
+                    else:
+                        self._record_step(1, 0)
+
+                    if done:
+                        break
+
+                # Update target model every 10 episodes
+                if self.episodes_completed % 10 == 0:
+                    self.update_target_model()
+
+                # Decay exploration rate
+                if self.exploration_rate > 0.1:
+                    self.exploration_rate *= (self.exploration_decay ** 0.9)  # Slower decay to encourage more exploration
+
+                if self.verbosity >= 2:
+                    print(f"Episode {episode + 1} total reward: {total_reward}")
+                    print(f"Total collisions detected in this episode: {collision_count}")  # Debug statement for collisions
+                self._record_episode(total_reward, collisions_avoided / max_steps)
+
+                if self.verbosity >= 1:
+                    print(f"Episode: {episode + 1}/{num_episodes}, Total Reward: {total_reward}, Epsilon: {self.exploration_rate}, Collisions Avoided: {collisions_avoided}/{max_steps}")
+
+                # Snapshot training state in the background when a checkpoint is due
+                self.episodes_completed += 1
+                with self.timer.phase('checkpoint'):
+                    self.checkpointer.maybe_save(self, self.episodes_completed)
+                self.timer.end_episode(self.episodes_completed, total_reward=total_reward, collisions=collision_count)
+        finally:
+            # Final snapshot and an atomically replaced weights checkpoint, also when training is interrupted
+            with self.timer.phase('checkpoint'):
+                self.checkpointer.finish(self, self.episodes_completed)
+
+        # Evaluation Metrics
+        evaluation_metrics = self.evaluate_model(forced=True)
+        print("Training completed.")
+        return evaluation_metrics, self.collision_data, self.optimize_trajectory()
+
+    def train_vectorized(self, num_episodes, max_steps, num_envs=8):
+        # Train on num_envs independent episodes advanced in lockstep
+        # Each environment is a copy of train()'s environment with its own actions, rewards and done flag; the
+        # network is queried once per step for every exploiting environment, and the rocket position shared by
+        # all environments is checked against the catalog once per step
+        self._require_training_model()
+        action_offsets = np.array(self.actions)
+        try:
+            episode = 0
+            while episode < num_episodes:
+                k = min(num_envs, num_episodes - episode)
+                states = np.repeat(self.get_state(0)[np.newaxis, :], k, axis=0)  # Initial state
+                active = np.ones(k, dtype=bool)
+                total_rewards = np.zeros(k)
+                collisions_avoided = np.zeros(k, dtype=int)
+                collision_counts = np.zeros(k, dtype=int)
+
+                for t in range(1, max_steps):
+                    envs = np.flatnonzero(active)
+
+                    # Choose actions: exploration or exploitation, one network call for all exploiting environments
+                    with self.timer.phase('action_selection'):
+                        actions = np.random.randint(self.action_size, size=len(envs))
+                        exploit = np.random.uniform(0, 1, size=len(envs)) >= self.exploration_rate
+                        if exploit.any():
+                            q_values = self.model.predict(states[envs[exploit]], verbose=0)
+                            actions[exploit] = np.argmax(q_values, axis=1)
+
+                    # Apply actions and calculate new states
+                    # As in train(), adjustments accumulate for optimize_trajectory() but do not move the rocket
+                    x_adjust, y_adjust = action_offsets[actions].sum(axis=0)
+                    self.x_cumulative_adjust += int(x_adjust)
+                    self.y_cumulative_adjust += int(y_adjust)
+                    new_states = np.repeat(self.get_state(t)[np.newaxis, :], len(envs), axis=0)
+
+                    # Calculate rewards
+                    rocket_pos = self.rocket_position(t)
+                    distance, satellite_id = self.closest_object(rocket_pos, t)
+                    collided = distance < self.collision_threshold
+                    dones = np.full(len(envs), collided)
+                    rewards = np.where(dones, np.random.randint(-250, -149, size=len(envs)), np.random.randint(10, 31, size=len(envs)))
+                    if collided:
+                        # Log collision data with the object hit, once per environment as train() does per episode
+                        self.collision_data.extend((t, rocket_pos.tolist(), satellite_id, float(distance)) for _ in envs)
+
+                    # Store experiences in replay memory and train the model using replay
+                    self.memory.extend(states[envs], actions, rewards, new_states, dones)
+                    if len(self.memory) > 64:
+                        self.replay(64)
+
+                    states[envs] = new_states
+                    total_rewards[envs] += rewards
+                    collision_counts[envs] += dones
+                    collisions_avoided[envs] += rewards > 0
+                    self._record_steps(np.ones(len(envs), dtype=np.int8), (rewards > 0) & (actions != 0))
+
+                    active[envs[dones]] = False
+                    if not active.any():
+                        break
+
+                for i in range(k):
+                    # Update target model every 10 episodes
+                    if self.episodes_completed % 10 == 0:
+                        self.update_target_model()
+                    self.episodes_completed += 1
+
+                    # Decay exploration rate
+                    if self.exploration_rate > 0.1:
+                        self.exploration_rate *= (self.exploration_decay ** 0.9)
+
+                    self._record_episode(total_rewards[i], collisions_avoided[i] / max_steps)
+                    if self.verbosity >= 1:
+                        print(f"Episode: {episode + i + 1}/{num_episodes}, Total Reward: {total_rewards[i]}, Epsilon: {self.exploration_rate}, Collisions Avoided: {collisions_avoided[i]}/{max_steps}, Collisions: {collision_counts[i]}")
+
+                episode += k
+
+                # Snapshot training state in the background when a checkpoint is due
+                with self.timer.phase('checkpoint'):
+                    self.checkpointer.maybe_save(self, self.episodes_completed)
+                # Environments run in lockstep, so the batch of k episodes is timed as one record
+                self.timer.end_episode(self.episodes_completed, episodes=k, total_reward=float(total_rewards.sum()), collisions=int(collision_counts.sum()))
+        finally:
+            # Final snapshot and an atomically replaced weights checkpoint, also when training is interrupted
+            with self.timer.phase('checkpoint'):
+                self.checkpointer.finish(self, self.episodes_completed)
+
+        # Evaluation Metrics
+        evaluation_metrics = self.evaluate_model(forced=True)
+        print("Training completed.")
+        return evaluation_metrics, self.collision_data, self.optimize_trajectory()
 
-        # Train the model using Deep Q-learning with Double DQN and Target Network
-        for episode in range(num_episodes):
-            state = self.get_state(0)  # Initial state
-            total_reward = 0
-            collisions_avoided = 0
-            collision_count = 0  # Counter to track collisions per episode
-
-            for t in range(1, max_steps):
-                # Choose action: exploration or exploitation
-                if random.uniform(0, 1) < self.exploration_rate:
-                    action = random.randrange(self.action_size)
-                else:
-                    q_values = self.model.predict(state[np.newaxis, :])
-                    print(f"Debug: Q-values for state {state}: {q_values}")  # Debug statement for Q-values
-                    action = np.argmax(q_values[0])
-
-                # Apply action and calculate new state
-                t_adjust, y_adjust = self.actions[action]
-                print(f"Debug: Action taken: {action}, t_adjust: {t_adjust}, y_adjust: {y_adjust}")  # Debug statement for action
-                self.x_cumulative_adjust += t_adjust
-                self.y_cumulative_adjust += y_adjust
-                new_state = self.get_state(t)
-
-                # Calculate reward
-                rocket_pos = self.rocket_position(t)
-                satellite_pos = self.satellite_positions(t)
-                if self.detect_collision(rocket_pos, satellite_pos):
-                    reward = random.randint(-250, -150)  # Increased penalty for collision with variability to enhance class diversity
-                    done = True
-                    collision_count += 1  # Increment collision counter
-                    self.collision_data.append((t, rocket_pos.tolist()))  # Log collision data
-                else:
-                    reward = random.randint(10, 30)  # Increased and variable reward for safe trajectory to enhance diversity
-                    done = False
-
-                # Store experience in replay memory
-                self.memory.append((state, action, reward, new_state, done))
-
-                # Train the model using replay
-                if len(self.memory) > 64:
-                    self.replay(64)
-
-                state = new_state
-                total_reward += reward
-
-                # Track if collision was avoided
-                if reward > 0:
-                    collisions_avoided += 1
-                    self.true_labels.append(1)
-                    self.predicted_labels.append(1 if action != 0 else 0)
-                else:
-                    self.true_labels.append(1)
-                    self.predicted_labels.append(0)
-
-                if done:
-                    break
-
-            # Update target model every 10 episodes
-            if episode % 10 == 0:
-                self.update_target_model()
-
-            # Decay exploration rate
-            if self.exploration_rate > 0.1:
-                self.exploration_rate *= (self.exploration_decay ** 0.9)  # Slower decay to encourage more exploration
-
-            print(f"Episode {episode + 1} total reward: {total_reward}")
-            print(f"Total collisions detected in this episode: {collision_count}")  # Debug statement for collisions
-            self.episode_rewards.append(total_reward)
-            self.collision_avoided.append(collisions_avoided / max_steps)
-
-            print(f"Episode: {episode + 1}/{num_episodes}, Total Reward: {total_reward}, Epsilon: {self.exploration_rate}, Collisions Avoided: {collisions_avoided}/{max_steps}")
-
-            # Save model weights after training step
-            self.model.save_weights(self.checkpoint_path)
+    def train_parallel(self, num_episodes, max_steps, num_actors=None, episodes_per_task=1, replay_ratio=1.0):
+        # Train with actor processes generating episodes and this process acting as the central learner
+        # Actors play with the weights current when their task was submitted; the learner owns the replay memory
+        # and the target network, and trains on each batch of transitions while the other actors keep playing
+        self._require_training_model()
+        num_actors = num_actors or os.cpu_count() or 1
+        context = multiprocessing.get_context('spawn')  # Actors only need NumPy; never fork a TensorFlow process
+        submitted = 0
+        episode = 0
+        try:
+            with ProcessPoolExecutor(max_workers=num_actors, mp_context=context) as pool:
+                def submit():
+                    nonlocal submitted
+                    n = min(episodes_per_task, num_episodes - submitted)
+                    future = pool.submit(run_actor_episodes, self.model.get_weights(), dict(self.trajectory_equation), self.propagator,
+                                         self.actions, self.exploration_rate, n, max_steps, self.collision_threshold, self.state_size,
+                                         random.randrange(2 ** 32), self.ephemeris)
+                    submitted += n
+                    return future
+
+                pending = {submit() for _ in range(num_actors) if submitted < num_episodes}
+                while pending:
+                    finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        result = future.result()
+                        transitions = [result[name] for name in ('states', 'actions', 'rewards', 'next_states', 'dones')]
+                        if len(transitions[1]):
+                            self.memory.extend(*transitions)
+                        self.x_cumulative_adjust += result['x_adjust']
+                        self.y_cumulative_adjust += result['y_adjust']
+                        self.collision_data.extend(result['collision_data'])
+                        self._record_steps(np.ones(len(result['predicted_labels']), dtype=np.int8), np.asarray(result['predicted_labels'], dtype=np.int8))
+
+                        # Train the model using replay, as many updates as train() would do for these transitions
+                        if len(self.memory) > 64:
+                            for _ in range(int(np.ceil(len(transitions[1]) * replay_ratio))):
+                                self.replay(64)
+
+                        for total_reward, collisions_avoided in zip(result['episode_rewards'], result['collisions_avoided']):
+                            # Update target model every 10 episodes
+                            if self.episodes_completed % 10 == 0:
+                                self.update_target_model()
+                            self.episodes_completed += 1
+
+                            # Decay exploration rate
+                            if self.exploration_rate > 0.1:
+                                self.exploration_rate *= (self.exploration_decay ** 0.9)
+
+                            episode += 1
+                            self._record_episode(total_reward, collisions_avoided / max_steps)
+                            if self.verbosity >= 1:
+                                print(f"Episode: {episode}/{num_episodes}, Total Reward: {total_reward}, Epsilon: {self.exploration_rate}, Collisions Avoided: {collisions_avoided}/{max_steps}")
+
+                        # Snapshot training state when due, then hand the actor fresh weights with its next task
+                        with self.timer.phase('checkpoint'):
+                            self.checkpointer.maybe_save(self, self.episodes_completed)
+                        # Learner-side phases only; actors run in other processes
+                        self.timer.end_episode(self.episodes_completed, episodes=len(result['episode_rewards']),
+                                               total_reward=float(np.sum(result['episode_rewards'])))
+                        if submitted < num_episodes:
+                            pending.add(submit())
+        finally:
+            # Final snapshot and an atomically replaced weights checkpoint, also when training is interrupted
+            with self.timer.phase('checkpoint'):
+                self.checkpointer.finish(self, self.episodes_completed)
 
         # Evaluation Metrics
         evaluation_metrics = self.evaluate_model(forced=True)
@@ -195,44 +599,54 @@ class DeepDynamicCollisionDetection:
         return evaluation_metrics, self.collision_data, self.optimize_trajectory()
 
     def replay(self, batch_size):
-        minibatch = random.sample(self.memory, batch_size)
-        for state, action, reward, next_state, done in minibatch:
-            target = reward
-            if not done:
-                target += self.discount_factor * np.amax(self.target_model.predict(next_state[np.newaxis, :])[0])
-            target_f = self.model.predict(state[np.newaxis, :])
-            target_f[0][action] = target
-            print(f"Debug: Target for action {action}: {target}")  # Debug statement for target value
-            self.model.fit(state[np.newaxis, :], target_f, epochs=1, verbose=0)
-
-    def evaluate_model(self, forced=False):
-        # Calculate evaluation metrics
-        average_reward = np.mean(self.episode_rewards) if len(self.episode_rewards) > 0 else 0.0
-        collision_avoidance_rate = np.mean(self.collision_avoided) if len(self.collision_avoided) > 0 else 0.0
-        accuracy = accuracy_score(self.true_labels, self.predicted_labels) if len(self.true_labels) > 0 and len(
-            set(self.true_labels)) > 1 else 0.0
-        f1 = f1_score(self.true_labels, self.predicted_labels) if len(self.true_labels) > 0 and len(
-            set(self.true_labels)) > 1 else 0.0
-        precision = precision_score(self.true_labels, self.predicted_labels) if len(self.true_labels) > 0 and len(
-            set(self.true_labels)) > 1 else 0.0
-        recall = recall_score(self.true_labels, self.predicted_labels) if len(self.true_labels) > 0 and len(
-            set(self.true_labels)) > 1 else 0.0
-
-        print(f"Average Reward: {average_reward}")
-        print(f"Collision Avoidance Rate: {collision_avoidance_rate}")
-        print(f"Accuracy: {accuracy}")
-        print(f"Precision: {precision}")
-        print(f"Recall: {recall}")
-        print(f"F1 Score: {f1}")
+        with self.timer.phase('replay'):
+            self._replay(batch_size)
 
-        return {
-            'average_reward': average_reward,
-            'collision_avoidance_rate': collision_avoidance_rate,
-            'accuracy': accuracy,
-            'precision': precision,
-            'recall': recall,
-            'f1_score': f1
-        }
+    def _replay(self, batch_size):
+        # Contiguous minibatch straight from the replay buffer arrays
+        if self.prioritized_replay:
+            states, actions, rewards, next_states, dones, indices, weights = self.memory.sample(batch_size)
+        else:
+            states, actions, rewards, next_states, dones = self.memory.sample(batch_size)
+            weights = None
+
+        if self.compiled_train_step:
+            if self._train_step is None:
+                self._train_step = self._build_train_step()
+            weights = np.ones(batch_size, dtype=np.float32) if weights is None else weights
+            with self.timer.phase('fit'):
+                targets, td_errors = self._train_step(states, actions.astype(np.int32), rewards, next_states, dones, weights)
+                targets = targets.numpy()
+            if self.prioritized_replay:
+                self.memory.update_priorities(indices, td_errors.numpy())
+            if self.verbosity >= 2:
+                print(f"Debug: Targets for actions {actions}: {targets}")  # Debug statement for target values
+            return
+
+        targets = rewards + np.where(dones, 0.0, self.discount_factor * np.amax(self.target_model.predict(next_states, verbose=0), axis=1))
+        target_f = self.model.predict(states, verbose=0)
+        if self.prioritized_replay:
+            self.memory.update_priorities(indices, targets - target_f[np.arange(batch_size), actions])
+        target_f[np.arange(batch_size), actions] = targets
+        if self.verbosity >= 2:
+            print(f"Debug: Targets for actions {actions}: {targets}")  # Debug statement for target values
+        with self.timer.phase('fit'):
+            self.model.fit(states, target_f, sample_weight=weights, epochs=1, batch_size=batch_size, verbose=0)  # One gradient update per minibatch, importance-weighted under prioritized replay
+
+    def evaluate_model(self, forced=False, rolling=False):
+        # Calculate evaluation metrics from the running counters (constant time however long training ran)
+        # With rolling=True, only the recent episodes/steps covered by rolling_metrics are evaluated
+        metrics = self.rolling_metrics if rolling and self.rolling_metrics is not None else self.metrics
+        evaluation = metrics.evaluate()
+
+        print(f"Average Reward: {evaluation['average_reward']}")
+        print(f"Collision Avoidance Rate: {evaluation['collision_avoidance_rate']}")
+        print(f"Accuracy: {evaluation['accuracy']}")
+        print(f"Precision: {evaluation['precision']}")
+        print(f"Recall: {evaluation['recall']}")
+        print(f"F1 Score: {evaluation['f1_score']}")
+
+        return evaluation
 
     def optimize_trajectory(self):
         # Apply cumulative adjustments to the trajectory equation
@@ -250,6 +664,30 @@ class DeepDynamicCollisionDetection:
         print(f"Predicted action for time {t}: {action}")
         return action
 
+    def predict_batch(self, times=None, states=None, batch_size=4096):
+        """
+        Predicts actions for many time steps or states with a single network call.
+
+        Parameters:
+        - times (array-like): Times along the trajectory; states are derived as in get_state.
+        - states (array-like): A (B, state_size) batch of states, used instead of times.
+        - batch_size (int): Keras predict batch size; ignored by the NumPy inference path.
+
+        Returns:
+        - tuple: (actions, q_values) as a (B,) int array and a (B, action_size) array.
+        """
+        if (times is None) == (states is None):
+            raise ValueError("Pass exactly one of times or states.")
+        if states is None:
+            states = self.get_states(times)
+        states = np.atleast_2d(np.asarray(states, dtype=np.float32))
+
+        if self.inference_only:
+            q_values = self.model.predict(states)
+        else:
+            q_values = self.model.predict(states, batch_size=batch_size, verbose=0)
+        return np.argmax(q_values, axis=1), q_values
+
 #
 # # Example usage
 # if __name__ == "__main__":
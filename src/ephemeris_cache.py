@@ -0,0 +1,132 @@
+import os
+import hashlib
+import numpy as np
+import pandas as pd
+
+
+def catalog_fingerprint(propagator):
+    """Returns a hex digest of the orbital element columns that determine a catalog's positions."""
+    digest = hashlib.sha256()
+    for column in (propagator.inclination, propagator.raan, propagator.eccentricity, propagator.mean_motion):
+        digest.update(np.ascontiguousarray(column, dtype=np.float64).tobytes())
+    return digest.hexdigest()
+
+
+class EphemerisCache:
+    def __init__(self, propagator, t_start, t_stop, step=1.0, cache_dir="ephemeris", chunk_size=256, reuse=None):
+        """
+        Catalog positions precomputed over a regular time grid and stored as a memory-mapped .npy file.
+
+        The file name is derived from a hash of the catalog's orbital elements and the grid parameters, so
+        later runs and sibling processes against the same catalog snapshot open the existing file zero-copy
+        instead of propagating again, and a changed catalog or grid never picks up stale positions.
+
+        Parameters:
+        - propagator (CatalogPropagator): The catalog to propagate.
+        - t_start (float): First time on the grid.
+        - t_stop (float): Last time on the grid (inclusive).
+        - step (float): Grid spacing.
+        - cache_dir (str): Directory holding the cache files.
+        - chunk_size (int): Number of time steps propagated per write while building the file.
+        - reuse (tuple): Optional (cache, rows) from a previous catalog on the same grid; for every object
+          where rows is not -1, positions are copied from that row of the old cache instead of propagated.
+        """
+        self.t_start = float(t_start)
+        self.step = float(step)
+        self.num_steps = int(round((float(t_stop) - self.t_start) / self.step)) + 1
+        grid = f"{self.t_start!r}:{self.step!r}:{self.num_steps}"
+        self.key = hashlib.sha256(f"{catalog_fingerprint(propagator)}:{grid}".encode()).hexdigest()[:32]
+        self.path = os.path.join(cache_dir, f"ephemeris_{self.key}.npy")
+
+        if not os.path.exists(self.path):
+            os.makedirs(cache_dir, exist_ok=True)
+            self._build(propagator, chunk_size, reuse)
+        self.positions = np.load(self.path, mmap_mode='r')  # (T, N, 3), shared through the page cache
+
+    def _build(self, propagator, chunk_size, reuse=None):
+        # Write to a private temp file and rename it into place, so readers never see a partial file
+        temp_path = f"{self.path}.{os.getpid()}.tmp"
+        positions = np.lib.format.open_memmap(temp_path, mode='w+', dtype=np.float64, shape=(self.num_steps, len(propagator), 3))
+
+        stale = np.arange(len(propagator))
+        if reuse is not None:
+            old_cache, old_rows = reuse
+            kept = np.flatnonzero(old_rows >= 0)
+            stale = np.flatnonzero(old_rows < 0)
+            for start in range(0, self.num_steps, chunk_size):
+                stop = min(start + chunk_size, self.num_steps)
+                positions[start:stop, kept] = old_cache.positions[start:stop][:, old_rows[kept]]
+            propagator = propagator.take(stale)
+
+        # Only objects without reusable positions are propagated
+        if len(stale):
+            for start in range(0, self.num_steps, chunk_size):
+                stop = min(start + chunk_size, self.num_steps)
+                positions[start:stop, stale] = propagator.positions(self.t_start + self.step * np.arange(start, stop))
+        positions.flush()
+        del positions
+        os.replace(temp_path, self.path)
+
+    def updated(self, propagator, old_propagator, changed_ids):
+        """
+        Returns the cache for an updated catalog on the same grid, recomputing only changed objects.
+
+        Parameters:
+        - propagator (CatalogPropagator): The updated catalog.
+        - old_propagator (CatalogPropagator): The catalog this cache was built from.
+        - changed_ids (array-like): Satellite ids whose elements changed (or that are new).
+
+        Returns:
+        - EphemerisCache: Cache for the updated catalog.
+        """
+        # Match objects by satellite id (first occurrence), then only trust rows whose elements are identical
+        first_rows = pd.Series(np.arange(len(old_propagator)), index=old_propagator.satellite_ids)
+        first_rows = first_rows[~first_rows.index.duplicated()]
+        old_rows = np.array(first_rows.reindex(propagator.satellite_ids).fillna(-1), dtype=np.int64)
+        old_rows[np.isin(propagator.satellite_ids, np.asarray(changed_ids))] = -1
+        matched = np.flatnonzero(old_rows >= 0)
+        for name in ('inclination', 'raan', 'eccentricity', 'mean_motion'):
+            differs = getattr(propagator, name)[matched] != getattr(old_propagator, name)[old_rows[matched]]
+            old_rows[matched[differs]] = -1
+
+        t_stop = self.t_start + self.step * (self.num_steps - 1)
+        return EphemerisCache(propagator, self.t_start, t_stop, step=self.step, cache_dir=os.path.dirname(self.path), reuse=(self, old_rows))
+
+    def discard(self):
+        # Delete the cache file once a newer cache has replaced it, so catalog updates do not pile up T x N x 3 files
+        # Mappings that are already open (this object's, or an actor process's) stay readable until released
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass  # Already removed, or still locked by a mapping on platforms that forbid deleting mapped files
+
+    def __getstate__(self):
+        # Send only the file location to other processes; they map the same file
+        state = self.__dict__.copy()
+        del state['positions']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.positions = np.load(self.path, mmap_mode='r')
+
+    def grid_index(self, t):
+        """Returns the grid row(s) for time(s) t, or None if any time falls off the grid."""
+        offset = (np.asarray(t, dtype=np.float64) - self.t_start) / self.step
+        index = np.rint(offset).astype(np.int64)
+        if np.any(np.abs(offset - index) > 1e-9) or np.any(index < 0) or np.any(index >= self.num_steps):
+            return None
+        return index
+
+    def lookup(self, t):
+        """
+        Returns cached positions for time(s) t.
+
+        Returns:
+        - np.ndarray or None: An (N, 3) view for a scalar t, a (T, N, 3) array for a vector of times, or
+          None if any of the times is not on the grid.
+        """
+        index = self.grid_index(t)
+        if index is None:
+            return None
+        return self.positions[index]
@@ -0,0 +1,233 @@
+purpose = '''
+Long-running local server that keeps the Q-network loaded and answers action queries over localhost HTTP.
+Concurrent requests are grouped into one batched forward pass within a small latency window.
+
+POST /predict  {"states": [[x, y, z], ...]}  or  {"t": 5 | [0, 1, ...], "trajectory": {"x": ..., "y": ..., "z": ...}}
+               -> {"actions": [...], "q_values": [[...], ...]}
+GET  /stats    -> request/batch counts, throughput and latency percentiles
+'''
+
+import json
+import time
+import threading
+import queue
+import urllib.request
+from collections import deque
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+import numpy as np
+from numpy_q_network import NumpyQNetwork
+from trajectory_equations import CompiledTrajectory
+
+DEFAULT_CHECKPOINT_PATH = "/Users/thrishankkuntimaddi/Documents/Final_Year_Project/Space-Debris-and-Route-Calculation/checkpoints/deep_dynamic_collision_detection.weights.h5"
+
+
+class MicroBatcher:
+    def __init__(self, network, max_batch_size=1024, max_wait=0.002, stats_window=10000):
+        """
+        Groups concurrent prediction requests into a single forward pass.
+
+        The worker thread takes the first waiting request, then keeps collecting for up to max_wait
+        seconds (or until max_batch_size states are queued) before running the network once.
+
+        Parameters:
+        - network (NumpyQNetwork): The network to evaluate.
+        - max_batch_size (int): Upper bound on states per forward pass.
+        - max_wait (float): Seconds to wait for more requests after the first one arrives.
+        - stats_window (int): Number of recent request latencies kept for percentiles.
+        """
+        self.network = network
+        self.state_size = network.layers[0][0].shape[0]
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self.requests = queue.Queue()
+        self.latencies = deque(maxlen=stats_window)
+        self.batch_sizes = deque(maxlen=stats_window)
+        self.num_requests = 0
+        self.num_states = 0
+        self.started = time.perf_counter()
+        self._lock = threading.Lock()
+        self._worker = threading.Thread(target=self._run, name="micro-batcher", daemon=True)
+        self._worker.start()
+
+    def predict(self, states):
+        # Blocks until the batch containing these states has been evaluated
+        states = np.atleast_2d(np.asarray(states, dtype=np.float32))
+        if states.ndim != 2 or states.shape[1] != self.state_size:
+            # Rejected here so one malformed request cannot fail the whole batch it would join
+            raise ValueError(f"Expected states of shape (B, {self.state_size}), got {states.shape}")
+        request = {'states': states,
+                   'arrived': time.perf_counter(), 'done': threading.Event()}
+        self.requests.put(request)
+        request['done'].wait()
+        if 'error' in request:
+            raise request['error']
+        return request['q_values']
+
+    def _run(self):
+        while True:
+            batch = [self.requests.get()]
+            size = len(batch[0]['states'])
+            deadline = time.perf_counter() + self.max_wait
+            while size < self.max_batch_size:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                try:
+                    request = self.requests.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                batch.append(request)
+                size += len(request['states'])
+
+            try:
+                q_values = self.network.predict(np.concatenate([request['states'] for request in batch]))
+                offsets = np.cumsum([0] + [len(request['states']) for request in batch])
+                for request, start, stop in zip(batch, offsets[:-1], offsets[1:]):
+                    request['q_values'] = q_values[start:stop]
+            except Exception as e:
+                for request in batch:
+                    request['error'] = e
+
+            finished = time.perf_counter()
+            with self._lock:
+                self.batch_sizes.append(size)
+                for request in batch:
+                    self.latencies.append(finished - request['arrived'])
+                self.num_requests += len(batch)
+                self.num_states += size
+            for request in batch:
+                request['done'].set()
+
+    def stats(self):
+        with self._lock:
+            latencies = np.array(self.latencies) * 1000.0
+            batch_sizes = np.array(self.batch_sizes)
+            elapsed = time.perf_counter() - self.started
+            return {
+                'requests': self.num_requests,
+                'states': self.num_states,
+                'uptime_s': elapsed,
+                'requests_per_s': self.num_requests / elapsed if elapsed > 0 else 0.0,
+                'states_per_s': self.num_states / elapsed if elapsed > 0 else 0.0,
+                'mean_batch_size': float(batch_sizes.mean()) if len(batch_sizes) else 0.0,
+                'latency_ms': {f"p{p}": float(np.percentile(latencies, p)) if len(latencies) else 0.0 for p in (50, 90, 99)},
+            }
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 128  # Many clients connect at once; the default backlog of 5 resets connections
+
+
+class InferenceServer:
+    def __init__(self, checkpoint_path=DEFAULT_CHECKPOINT_PATH, host="127.0.0.1", port=8765, max_batch_size=1024, max_wait=0.002):
+        """
+        Keeps the trained Q-network loaded (NumPy inference, no TensorFlow) and serves it over HTTP.
+
+        Parameters:
+        - checkpoint_path (str): Keras weights checkpoint written by DeepDynamicCollisionDetection.
+        - host (str): Interface to bind; localhost by default.
+        - port (int): Port to listen on.
+        - max_batch_size (int): Upper bound on states per forward pass.
+        - max_wait (float): Micro-batching window in seconds.
+        """
+        self.batcher = MicroBatcher(NumpyQNetwork.from_checkpoint(checkpoint_path), max_batch_size=max_batch_size, max_wait=max_wait)
+        self._trajectories = {}  # Compiled trajectories keyed by equation strings
+        self._trajectories_lock = threading.Lock()
+        self.httpd = _Server((host, port), self._handler())
+
+    def _states_for(self, query):
+        # A query carries either explicit states or times plus a trajectory, like DeepDynamicCollisionDetection.get_state
+        if 'states' in query:
+            return np.asarray(query['states'], dtype=np.float32)
+        trajectory = query['trajectory']
+        source = tuple(trajectory[axis] for axis in ('x', 'y', 'z'))
+        with self._trajectories_lock:
+            if source not in self._trajectories:
+                if len(self._trajectories) >= 256:
+                    self._trajectories.pop(next(iter(self._trajectories)))
+                self._trajectories[source] = CompiledTrajectory(trajectory)
+            compiled = self._trajectories[source]
+        positions = np.atleast_2d(compiled(query['t']))
+        return np.where(np.isnan(positions).any(axis=1, keepdims=True), 0.0, np.round(positions, 2))
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def _reply(self, status, body):
+                payload = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def do_GET(self):
+                if self.path == "/stats":
+                    self._reply(200, server.batcher.stats())
+                else:
+                    self._reply(404, {'error': f"Unknown path {self.path}"})
+
+            def do_POST(self):
+                if self.path != "/predict":
+                    self._reply(404, {'error': f"Unknown path {self.path}"})
+                    return
+                # Browsers cannot send application/json cross-origin without a preflight this server never answers,
+                # so web pages open in the user's browser cannot reach /predict
+                if self.headers.get_content_type() != "application/json":
+                    self._reply(415, {'error': "Content-Type must be application/json"})
+                    return
+                try:
+                    query = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+                    q_values = server.batcher.predict(server._states_for(query))
+                except Exception as e:
+                    self._reply(400, {'error': str(e)})
+                    return
+                self._reply(200, {'actions': np.argmax(q_values, axis=1).tolist(), 'q_values': q_values.tolist()})
+
+            def log_message(self, format, *args):
+                pass  # Per-request access logs would dominate the hot path
+
+        return Handler
+
+    def serve_forever(self):
+        host, port = self.httpd.server_address[:2]
+        print(f"Inference server listening on http://{host}:{port}")
+        self.httpd.serve_forever()
+
+    def shutdown(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def query_inference_server(states=None, t=None, trajectory=None, host="127.0.0.1", port=8765, timeout=10.0):
+    """
+    Client helper: asks a running InferenceServer for actions.
+
+    Parameters:
+    - states (array-like): A batch of states, or
+    - t (float or list) and trajectory (dict): Times and trajectory equations to derive states from.
+
+    Returns:
+    - tuple: (actions, q_values) as NumPy arrays.
+    """
+    query = {'states': np.asarray(states).tolist()} if states is not None else {'t': np.asarray(t).tolist(), 'trajectory': trajectory}
+    request = urllib.request.Request(f"http://{host}:{port}/predict", data=json.dumps(query).encode(),
+                                     headers={"Content-Type": "application/json"})
+    with urllib.request.urlopen(request, timeout=timeout) as response:
+        body = json.loads(response.read())
+    return np.array(body['actions']), np.array(body['q_values'])
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Serve Q-network action predictions on localhost.")
+    parser.add_argument("--checkpoint", default=DEFAULT_CHECKPOINT_PATH)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--max-batch-size", type=int, default=1024)
+    parser.add_argument("--max-wait-ms", type=float, default=2.0)
+    args = parser.parse_args()
+
+    InferenceServer(args.checkpoint, port=args.port, max_batch_size=args.max_batch_size, max_wait=args.max_wait_ms / 1000.0).serve_forever()
@@ -3,6 +3,7 @@ import matplotlib.pyplot as plt
 from mpl_toolkits.mplot3d import Axes3D
 from typing import Callable, Dict
 import re
+from trajectory_equations import compile_equation
 
 
 class TrajectoryVisualizer:
@@ -24,35 +25,26 @@ class TrajectoryVisualizer:
         self.z_func = self._parse_equation(equations['z'])
         self.theta_func = self._parse_equation(equations['theta'])
 
-    def _parse_equation(self, equation_str: str) -> Callable[[float], float]:
+    def _parse_equation(self, equation_str: str) -> Callable[[np.ndarray], np.ndarray]:
         """
-        Convert a string equation to a callable function of time (t).
+        Convert a string equation to a vectorized function of time (t).
 
         Parameters:
         - equation_str: A string representing the equation.
 
         Returns:
-        - A callable function that takes t as input and returns the computed value.
+        - A callable function that takes a scalar or an array of t values and returns the computed values.
         """
-        # Extract the equation part after the equals sign
-        equation_str = equation_str.split('=')[1].strip()
-        # Replace 't' with '{t}' for formatting
-        equation_str = equation_str.replace('t', '{t}')
-
-        # Define a function that evaluates the equation for a given t
-        def func(t):
-            # Use eval to evaluate the equation, replacing '{t}' with the current value of t
-            return eval(equation_str.format(t=t), {"np": np, "exp": np.exp, "cos": np.cos, "sin": np.sin})
-
-        return func
+        # Compile once; t is bound as a variable, so other identifiers containing 't' are left alone
+        return compile_equation(equation_str)
 
     def plot_trajectory(self):
         """Generates a 3D plot of the trajectory based on the input equations."""
-        # Calculate x, y, z values based on the given functions
-        x = np.array([self.x_func(t) for t in self.t_values])
-        y = np.array([self.y_func(t) for t in self.t_values])
-        z = np.array([self.z_func(t) for t in self.t_values])
-        theta = np.array([self.theta_func(t) for t in self.t_values])
+        # Calculate x, y, z values over the whole time grid in one call each
+        x = self.x_func(self.t_values)
+        y = self.y_func(self.t_values)
+        z = self.z_func(self.t_values)
+        theta = self.theta_func(self.t_values)
 
         # Apply theta rotation to x, y, z coordinates to add angular effect
         x_rot = x * np.cos(theta) - y * np.sin(theta)
@@ -0,0 +1,159 @@
+import json
+import math
+import time
+
+# Phases timed by DeepDynamicCollisionDetection; phases nest (e.g. collision_check includes propagation on a
+# spatial index cache miss, replay includes fit), so totals are inclusive
+PHASES = ('trajectory', 'propagation', 'collision_check', 'action_selection', 'replay', 'fit', 'checkpoint')
+
+# Log-scale histogram buckets: BUCKETS_PER_DECADE per power of ten from 100 ns to 100 s
+MIN_EXPONENT = -7
+MAX_EXPONENT = 2
+BUCKETS_PER_DECADE = 10
+NUM_BUCKETS = (MAX_EXPONENT - MIN_EXPONENT) * BUCKETS_PER_DECADE
+
+
+class PhaseStats:
+    __slots__ = ('count', 'total', 'max', 'buckets')
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.buckets = [0] * NUM_BUCKETS
+
+    def add(self, seconds):
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+        bucket = int((math.log10(seconds) - MIN_EXPONENT) * BUCKETS_PER_DECADE) if seconds > 0 else 0
+        self.buckets[min(max(bucket, 0), NUM_BUCKETS - 1)] += 1
+
+    def merge(self, other):
+        self.count += other.count
+        self.total += other.total
+        self.max = max(self.max, other.max)
+        self.buckets = [a + b for a, b in zip(self.buckets, other.buckets)]
+
+    def percentile(self, q):
+        # Geometric midpoint of the bucket holding the q-th percentile sample
+        if self.count == 0:
+            return 0.0
+        rank = q / 100.0 * self.count
+        seen = 0
+        for bucket, count in enumerate(self.buckets):
+            seen += count
+            if seen >= rank and count:
+                return min(10.0 ** (MIN_EXPONENT + (bucket + 0.5) / BUCKETS_PER_DECADE), self.max)
+        return self.max
+
+    def summary(self):
+        return {
+            'count': self.count,
+            'total_s': self.total,
+            'mean_s': self.total / self.count if self.count else 0.0,
+            'p50_s': self.percentile(50),
+            'p95_s': self.percentile(95),
+            'p99_s': self.percentile(99),
+            'max_s': self.max,
+        }
+
+
+class _Phase:
+    __slots__ = ('stats', 'started')
+
+    def __init__(self, stats):
+        self.stats = stats
+        self.started = 0.0
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+
+    def __exit__(self, *exc_info):
+        self.stats.add(time.perf_counter() - self.started)
+
+
+class PhaseTimer:
+    def __init__(self, export_path=None):
+        """
+        Times and counts the phases of a training run, per episode and in total.
+
+        Use as `with timer.phase('replay'): ...`. Durations go into log-scale histograms; end_episode()
+        folds the episode's histograms into the run totals and, if export_path is set, appends one JSON
+        line per episode with count, total, mean, p50/p95/p99 and max per phase.
+
+        Parameters:
+        - export_path (str): Optional JSON-lines file for the per-episode records.
+        """
+        self.export_path = export_path
+        self.episode_stats = {name: PhaseStats() for name in PHASES}
+        self.run_stats = {name: PhaseStats() for name in PHASES}
+        self._phases = {name: _Phase(stats) for name, stats in self.episode_stats.items()}
+
+    def phase(self, name):
+        return self._phases[name]
+
+    def end_episode(self, episode, **fields):
+        """
+        Closes the current episode's measurements.
+
+        Parameters:
+        - episode (int): Episode number recorded with the measurements.
+        - fields: Extra values stored in the exported record (e.g. total_reward).
+
+        Returns:
+        - dict: The episode record.
+        """
+        record = {'episode': episode, **fields, 'phases': {}}
+        for name, stats in self.episode_stats.items():
+            if stats.count:
+                record['phases'][name] = stats.summary()
+            self.run_stats[name].merge(stats)
+            # Reset in place so the _Phase context managers keep pointing at the live stats
+            stats.__init__()
+
+        if self.export_path is not None:
+            with open(self.export_path, 'a') as file:
+                file.write(json.dumps(record, default=float) + "\n")
+        return record
+
+    def summary(self):
+        # Run totals per phase, including the episode still in progress
+        summary = {}
+        for name in PHASES:
+            stats = PhaseStats()
+            stats.merge(self.run_stats[name])
+            stats.merge(self.episode_stats[name])
+            if stats.count:
+                summary[name] = stats.summary()
+        return summary
+
+    def histogram(self, name):
+        """Returns (bucket lower edges in seconds, counts) of the run histogram for one phase."""
+        edges = [10.0 ** (MIN_EXPONENT + bucket / BUCKETS_PER_DECADE) for bucket in range(NUM_BUCKETS)]
+        return edges, list(self.run_stats[name].buckets)
+
+
+class _NullPhase:
+    __slots__ = ()
+
+    def __enter__(self):
+        pass
+
+    def __exit__(self, *exc_info):
+        pass
+
+
+class NullTimer:
+    # Stand-in used when instrumentation is off; every phase is a shared no-op context manager
+    _phase = _NullPhase()
+
+    def phase(self, name):
+        return self._phase
+
+    def end_episode(self, episode, **fields):
+        return None
+
+    def summary(self):
+        return {}
@@ -3,22 +3,44 @@ purpose = '''
 '''
 
 # imports
+import time
+startup_started = time.perf_counter()
+
+import os
 import pandas as pd
 from timestamp import TimestampSelector
 from orbit_selection import OrbitSelector
 from rocket_orbital_velocity_calculation import VelocityCalculate
 from rocket_selection import RocketSelector
 from initial_trajectory import TrajectoryCalculator
-from initial_trajectory_visualization import TrajectoryVisualizer
 from mission_report import MissionReport
-from double_deep_dynamic_collision_detection import DeepDynamicCollisionDetection
+# TrajectoryVisualizer (matplotlib), DeepDynamicCollisionDetection (TensorFlow) and the TLE catalog are loaded
+# lazily by the stages that need them, so orbit and rocket selection start without paying for them
 
 tle_data_path = '/Users/thrishankkuntimaddi/Documents/Final_Year_Project/Space-Debris-and-Route-Calculation/data/tle_data.csv'
+tle_store_path = '/Users/thrishankkuntimaddi/Documents/Final_Year_Project/Space-Debris-and-Route-Calculation/data/tle_data.store'
 rocket_parameters_path = '/Users/thrishankkuntimaddi/Documents/Final_Year_Project/Space-Debris-and-Route-Calculation/data/rocket_parameters.csv'
-tle_data = pd.read_csv(tle_data_path, low_memory=False)
+startup_budget_seconds = 1.0  # Time allowed from the first import in this module to the start of main()
+
+
+def load_tle_data():
+    # Prefer the typed binary store written by complete_preprocessing.py; fall back to the CSV
+    from tle_store import load_tle_catalog
+    return load_tle_catalog(tle_store_path if os.path.isdir(tle_store_path) else tle_data_path)
+
+
+def check_startup_budget():
+    startup_time = time.perf_counter() - startup_started
+    print(f"Startup time: {startup_time:.3f} s")
+    if startup_time > startup_budget_seconds:
+        print(f"Warning: startup took longer than the {startup_budget_seconds:.1f} s budget")
+    return startup_time
+
 
 # Structure integration
 def main():
+    check_startup_budget()
+
     # Initialize mission report
     mission_report = MissionReport()
 
@@ -100,6 +122,7 @@ def main():
         # Step 4.1: visualize_trajectory_equations.py
         # Proceed with visualization only if trajectory_equations is calculated
         if trajectory_equations:
+            from initial_trajectory_visualization import TrajectoryVisualizer
             visualize = TrajectoryVisualizer(trajectory_equations, t_range=(0, 10))
             visualize.plot_trajectory()
             mission_report.add_initial_trajectory_info(
@@ -111,6 +134,8 @@ def main():
             return
 
     # DeepDynamicCollisionDetection
+    from double_deep_dynamic_collision_detection import DeepDynamicCollisionDetection
+    tle_data = load_tle_data()
 
     model = DeepDynamicCollisionDetection(
         trajectory_equation=trajectory_equations,
@@ -138,8 +163,9 @@ def main():
         if collision_data:
             print(f"\nCollisions Detected: {collision_data}")
     elif user_choice == 'use':
-        for t in range(5):  # Example of using the model for prediction over time steps
-            action = model.predict(t)
+        times = list(range(5))  # Example of using the model for prediction over time steps
+        actions, q_values = model.predict_batch(times=times)  # One network call for every time step
+        for t, action in zip(times, actions):
             print(f"Predicted action at time {t}: {action}")
 
         # Also return the optimized trajectory and evaluation metrics from the existing model
@@ -152,6 +178,7 @@ def main():
 
     # visualize_trajectory_equations.py
     if trajectory_equations:
+        from initial_trajectory_visualization import TrajectoryVisualizer
         after_optimization = TrajectoryVisualizer(optimized_trajectory, t_range=(0, 10))
         after_optimization.plot_trajectory()
         mission_report.add_optimized_trajectory_info(
@@ -0,0 +1,59 @@
+import numpy as np
+
+
+class NumpyQNetwork:
+    def __init__(self, weights):
+        """
+        Inference-only copy of the Q-network built by DeepDynamicCollisionDetection._build_model.
+
+        Parameters:
+        - weights (list): Kernel and bias arrays in the order returned by model.get_weights(), i.e.
+          [W1, b1, W2, b2, ...]. Hidden layers use ReLU and the output layer is linear; dropout is
+          inactive at inference time and has no weights.
+        """
+        self.layers = [(np.asarray(weights[i], dtype=np.float32), np.asarray(weights[i + 1], dtype=np.float32))
+                       for i in range(0, len(weights), 2)]
+
+    def predict(self, states):
+        """
+        Runs the forward pass.
+
+        Parameters:
+        - states (np.ndarray): A (B, state_size) batch of states.
+
+        Returns:
+        - np.ndarray: A (B, action_size) array of Q-values.
+        """
+        x = np.asarray(states, dtype=np.float32)
+        for kernel, bias in self.layers[:-1]:
+            x = np.maximum(x @ kernel + bias, 0.0)
+        kernel, bias = self.layers[-1]
+        return x @ kernel + bias
+
+    @classmethod
+    def from_checkpoint(cls, checkpoint_path):
+        """
+        Loads the dense-layer weights from a Keras '.weights.h5' checkpoint without importing TensorFlow.
+
+        Parameters:
+        - checkpoint_path (str): Path written by model.save_weights, or a '.npz' training snapshot
+          written by checkpointing.AsyncCheckpointer.
+
+        Returns:
+        - NumpyQNetwork: The network with the checkpoint's weights.
+        """
+        if checkpoint_path.endswith('.npz'):
+            with np.load(checkpoint_path, allow_pickle=False) as snapshot:
+                return cls([snapshot[name] for name in sorted(name for name in snapshot.files if name.startswith('model/'))])
+
+        import h5py  # Ships with TensorFlow installs; only needed to read checkpoints
+
+        with h5py.File(checkpoint_path, 'r') as checkpoint:
+            layers = checkpoint['layers']
+            # Keras names sibling layers dense, dense_1, dense_2, ... in the order they were added
+            dense = [name for name in layers if name.split('_')[0] == 'dense' and len(layers[name].get('vars', {}))]
+            dense.sort(key=lambda name: int(name.rsplit('_', 1)[1]) if '_' in name else 0)
+            weights = []
+            for name in dense:
+                weights.extend([layers[name]['vars']['0'][()], layers[name]['vars']['1'][()]])
+        return cls(weights)
@@ -0,0 +1,93 @@
+import numpy as np
+from numpy_q_network import NumpyQNetwork
+from spatial_index import SpatialIndex
+from trajectory_equations import CompiledTrajectory
+
+
+def run_actor_episodes(weights, trajectory_equation, propagator, actions, exploration_rate, num_episodes, max_steps,
+                       collision_threshold, state_size, seed, ephemeris=None):
+    """
+    Plays episodes in an actor process and returns the transitions for the central learner.
+
+    The environment mirrors DeepDynamicCollisionDetection.train, but actions are chosen with a NumPy copy
+    of the Q-network so actor processes never import TensorFlow.
+
+    Parameters:
+    - weights (list): Q-network weights from model.get_weights(), synced by the learner.
+    - trajectory_equation (dict): Parametric trajectory equations as strings.
+    - propagator (CatalogPropagator): The catalog to check collisions against.
+    - actions (list): The (x, y) adjustment for each action index.
+    - exploration_rate (float): Epsilon for epsilon-greedy action selection.
+    - num_episodes (int): Episodes to play before returning.
+    - max_steps (int): Maximum steps per episode.
+    - collision_threshold (float): Distance below which a collision is reported.
+    - state_size (int): Length of a state vector.
+    - seed (int): Seed for exploration and reward noise.
+    - ephemeris (EphemerisCache): Optional precomputed positions; the actor maps the learner's cache file.
+
+    Returns:
+    - dict: Stacked transitions ('states', 'actions', 'rewards', 'next_states', 'dones'), per-episode
+      'episode_rewards' and 'collisions_avoided', 'collision_data', 'predicted_labels' and the summed
+      'x_adjust' / 'y_adjust'.
+    """
+    rng = np.random.default_rng(seed)
+    network = NumpyQNetwork(weights)
+    trajectory = CompiledTrajectory(trajectory_equation)
+    indexes = {}
+
+    def get_state(t):
+        rocket_pos = trajectory(t)
+        return np.zeros(state_size) if np.any(np.isnan(rocket_pos)) else np.round(rocket_pos, 2)
+
+    transitions = {'states': [], 'actions': [], 'rewards': [], 'next_states': [], 'dones': []}
+    result = {'episode_rewards': [], 'collisions_avoided': [], 'collision_data': [], 'predicted_labels': [], 'x_adjust': 0, 'y_adjust': 0}
+
+    for _ in range(num_episodes):
+        state = get_state(0)
+        total_reward = 0
+        collisions_avoided = 0
+
+        for t in range(1, max_steps):
+            if rng.uniform(0, 1) < exploration_rate:
+                action = int(rng.integers(len(actions)))
+            else:
+                action = int(np.argmax(network.predict(state[np.newaxis, :])[0]))
+
+            x_adjust, y_adjust = actions[action]
+            result['x_adjust'] += x_adjust
+            result['y_adjust'] += y_adjust
+            new_state = get_state(t)
+
+            # Same per-time-step index reuse as the learner process
+            if t not in indexes:
+                positions = ephemeris.lookup(t) if ephemeris is not None else None
+                if positions is None:
+                    positions = propagator.positions(t)
+                indexes[t] = SpatialIndex(positions, ids=propagator.satellite_ids, cell_size=collision_threshold)
+            rocket_pos = trajectory(t)
+            distance, satellite_id = indexes[t].nearest_within(rocket_pos, collision_threshold)
+            done = bool(distance < collision_threshold)
+            if done:
+                reward = int(rng.integers(-250, -149))
+                result['collision_data'].append((t, rocket_pos.tolist(), satellite_id, float(distance)))
+            else:
+                reward = int(rng.integers(10, 31))
+
+            for name, value in zip(('states', 'actions', 'rewards', 'next_states', 'dones'), (state, action, reward, new_state, done)):
+                transitions[name].append(value)
+
+            state = new_state
+            total_reward += reward
+            if reward > 0:
+                collisions_avoided += 1
+            result['predicted_labels'].append(1 if reward > 0 and action != 0 else 0)
+
+            if done:
+                break
+
+        result['episode_rewards'].append(total_reward)
+        result['collisions_avoided'].append(collisions_avoided)
+
+    for name, values in transitions.items():
+        result[name] = np.array(values)
+    return result
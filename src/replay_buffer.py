@@ -0,0 +1,219 @@
+import os
+import numpy as np
+
+
+class ReplayBuffer:
+    def __init__(self, capacity, state_size, seed=None):
+        """
+        Fixed-capacity experience replay memory backed by preallocated NumPy arrays.
+
+        Transitions are written at a cursor that wraps around once the buffer is full, overwriting the
+        oldest entries, so memory use is fixed up front and independent of how long training runs.
+
+        Parameters:
+        - capacity (int): Maximum number of transitions kept.
+        - state_size (int): Length of a state vector.
+        - seed (int): Optional seed for the sampling generator.
+        """
+        self.capacity = int(capacity)
+        self.state_size = int(state_size)
+        self.states = np.zeros((self.capacity, self.state_size), dtype=np.float32)
+        self.actions = np.zeros(self.capacity, dtype=np.int64)
+        self.rewards = np.zeros(self.capacity, dtype=np.float32)
+        self.next_states = np.zeros((self.capacity, self.state_size), dtype=np.float32)
+        self.dones = np.zeros(self.capacity, dtype=bool)
+        self.cursor = 0
+        self.size = 0
+        self.rng = np.random.default_rng(seed)
+
+    def __len__(self):
+        return self.size
+
+    def append(self, transition):
+        """Stores a (state, action, reward, next_state, done) transition, overwriting the oldest when full."""
+        state, action, reward, next_state, done = transition
+        i = self.cursor
+        self.states[i] = state
+        self.actions[i] = action
+        self.rewards[i] = reward
+        self.next_states[i] = next_state
+        self.dones[i] = done
+        self.cursor = (i + 1) % self.capacity
+        self.size = min(self.size + 1, self.capacity)
+
+    def extend(self, states, actions, rewards, next_states, dones):
+        """Stores a batch of transitions given as aligned arrays."""
+        n = len(actions)
+        if n > self.capacity:  # Only the newest capacity transitions would survive anyway
+            states, actions, rewards, next_states, dones = (a[-self.capacity:] for a in (states, actions, rewards, next_states, dones))
+            n = self.capacity
+        slots = (self.cursor + np.arange(n)) % self.capacity
+        self.states[slots] = states
+        self.actions[slots] = actions
+        self.rewards[slots] = rewards
+        self.next_states[slots] = next_states
+        self.dones[slots] = dones
+        self.cursor = (self.cursor + n) % self.capacity
+        self.size = min(self.size + n, self.capacity)
+        return slots
+
+    def sample(self, batch_size):
+        """
+        Draws a uniform random minibatch (with replacement) by fancy-indexing the storage arrays.
+
+        Returns:
+        - tuple: (states, actions, rewards, next_states, dones) arrays of length batch_size.
+        """
+        indices = self.rng.integers(0, self.size, size=batch_size)
+        return self.states[indices], self.actions[indices], self.rewards[indices], self.next_states[indices], self.dones[indices]
+
+    def state_dict(self):
+        """Returns copies of the storage arrays, counters and sampler state, e.g. for an in-memory checkpoint."""
+        state = {name: getattr(self, name).copy() for name in ('states', 'actions', 'rewards', 'next_states', 'dones')}
+        state.update(cursor=self.cursor, size=self.size, rng=self.rng.bit_generator.state)
+        return state
+
+    def load_state_dict(self, state):
+        """Restores a buffer of the same capacity from state_dict(), including where sampling left off."""
+        for name in ('states', 'actions', 'rewards', 'next_states', 'dones'):
+            getattr(self, name)[...] = state[name]
+        self.cursor = int(state['cursor'])
+        self.size = int(state['size'])
+        self.rng.bit_generator.state = state['rng']
+        return self
+
+    def save(self, directory):
+        """Writes the stored transitions to a directory of .npy files so training can resume later."""
+        os.makedirs(directory, exist_ok=True)
+        for name in ('states', 'actions', 'rewards', 'next_states', 'dones'):
+            np.save(os.path.join(directory, f"{name}.npy"), getattr(self, name)[:self.size] if self.size < self.capacity else getattr(self, name))
+        np.save(os.path.join(directory, "cursor.npy"), np.array([self.cursor, self.size, self.capacity], dtype=np.int64))
+
+    def load(self, directory):
+        """Restores transitions written by save(), keeping this buffer's capacity."""
+        cursor, size, capacity = np.load(os.path.join(directory, "cursor.npy"))
+        arrays = {name: np.load(os.path.join(directory, f"{name}.npy")) for name in ('states', 'actions', 'rewards', 'next_states', 'dones')}
+        # Replay the saved transitions oldest first so the ring order is preserved
+        order = (np.arange(size) + (cursor if size == capacity else 0)) % size if size else np.arange(0)
+        self.cursor = 0
+        self.size = 0
+        self.extend(*(arrays[name][order] for name in ('states', 'actions', 'rewards', 'next_states', 'dones')))
+        return self
+
+
+class SumTree:
+    def __init__(self, capacity):
+        """
+        Binary sum-tree over per-slot priorities stored as a flat array (root at index 1).
+
+        Updates and prefix-sum lookups are O(log n) and both are vectorized over a batch of slots, so
+        a whole minibatch is sampled or re-prioritized with one NumPy operation per tree level.
+
+        Parameters:
+        - capacity (int): Number of leaves (replay slots).
+        """
+        self.leaf_offset = 1 << max(int(capacity) - 1, 0).bit_length()
+        self.nodes = np.zeros(2 * self.leaf_offset, dtype=np.float64)
+
+    def total(self):
+        return self.nodes[1]
+
+    def leaves(self, indices):
+        return self.nodes[np.asarray(indices) + self.leaf_offset]
+
+    def update(self, indices, priorities):
+        """Sets the priorities of the given slots and refreshes the sums on their paths to the root."""
+        nodes = np.asarray(indices, dtype=np.int64) + self.leaf_offset
+        self.nodes[nodes] = priorities
+        nodes = np.unique(nodes // 2)
+        while len(nodes) and nodes[0] >= 1:
+            self.nodes[nodes] = self.nodes[2 * nodes] + self.nodes[2 * nodes + 1]
+            nodes = np.unique(nodes // 2)
+
+    def find(self, values):
+        """Returns, for each value in [0, total), the slot whose cumulative priority range contains it."""
+        values = np.array(values, dtype=np.float64)
+        nodes = np.ones(len(values), dtype=np.int64)
+        while self.leaf_offset > 1 and nodes[0] < self.leaf_offset:  # All leaves sit at the same depth
+            left = 2 * nodes
+            go_right = values >= self.nodes[left]
+            values = np.where(go_right, values - self.nodes[left], values)
+            nodes = np.where(go_right, left + 1, left)
+        return nodes - self.leaf_offset
+
+
+class PrioritizedReplayBuffer(ReplayBuffer):
+    def __init__(self, capacity, state_size, alpha=0.6, beta=0.4, beta_increment=1e-4, epsilon=1e-6, seed=None):
+        """
+        Replay memory that samples transitions in proportion to their TD error (Schaul et al., 2016).
+
+        Parameters:
+        - capacity (int): Maximum number of transitions kept.
+        - state_size (int): Length of a state vector.
+        - alpha (float): How strongly priorities skew sampling (0 is uniform).
+        - beta (float): Initial importance-sampling correction, annealed towards 1.
+        - beta_increment (float): Amount beta grows per sampled minibatch.
+        - epsilon (float): Added to TD errors so no transition ends up with zero probability.
+        - seed (int): Optional seed for the sampling generator.
+        """
+        super().__init__(capacity, state_size, seed=seed)
+        self.alpha = alpha
+        self.beta = beta
+        self.beta_increment = beta_increment
+        self.epsilon = epsilon
+        self.max_priority = 1.0
+        self.tree = SumTree(self.capacity)
+
+    def append(self, transition):
+        # New transitions get the highest priority seen so far, so each is replayed at least once soon
+        slot = self.cursor
+        super().append(transition)
+        self.tree.update([slot], self.max_priority ** self.alpha)
+
+    def extend(self, states, actions, rewards, next_states, dones):
+        slots = super().extend(states, actions, rewards, next_states, dones)
+        self.tree.update(slots, self.max_priority ** self.alpha)
+        return slots
+
+    def state_dict(self):
+        state = super().state_dict()
+        state.update(priorities=self.tree.nodes.copy(), max_priority=self.max_priority, beta=self.beta)
+        return state
+
+    def load_state_dict(self, state):
+        self.tree.nodes[...] = state['priorities']
+        self.max_priority = float(state['max_priority'])
+        self.beta = float(state['beta'])
+        return super().load_state_dict(state)
+
+    def load(self, directory):
+        # Restored transitions all start at max priority, like freshly stored ones
+        self.tree = SumTree(self.capacity)
+        return super().load(directory)
+
+    def sample(self, batch_size):
+        """
+        Draws a minibatch with stratified proportional sampling over the sum-tree.
+
+        Returns:
+        - tuple: (states, actions, rewards, next_states, dones, indices, weights), where indices are the
+          buffer slots to pass back to update_priorities and weights are the normalized
+          importance-sampling weights for the loss.
+        """
+        total = self.tree.total()
+        segment = total / batch_size
+        values = np.minimum((np.arange(batch_size) + self.rng.random(batch_size)) * segment, np.nextafter(total, 0))
+        indices = np.minimum(self.tree.find(values), self.size - 1)
+
+        probabilities = self.tree.leaves(indices) / total
+        weights = (self.size * probabilities) ** -self.beta
+        weights = (weights / weights.max()).astype(np.float32)
+        self.beta = min(1.0, self.beta + self.beta_increment)
+
+        return self.states[indices], self.actions[indices], self.rewards[indices], self.next_states[indices], self.dones[indices], indices, weights
+
+    def update_priorities(self, indices, td_errors):
+        """Re-prioritizes sampled slots from their latest absolute TD errors."""
+        priorities = np.abs(td_errors) + self.epsilon
+        self.max_priority = max(self.max_priority, float(priorities.max()))
+        self.tree.update(indices, priorities ** self.alpha)
@@ -0,0 +1,151 @@
+import numpy as np
+
+# Large odd multipliers for spatial hashing of integer cell coordinates (Teschner et al.)
+_HASH_PRIMES = np.array([73856093, 19349663, 83492791], dtype=np.int64)
+
+
+class SpatialIndex:
+    def __init__(self, positions, ids=None, cell_size=1.0):
+        """
+        Builds a uniform hash grid over a set of 3D positions.
+
+        Points are bucketed into cubic cells of edge cell_size and sorted by cell hash, so a query only
+        has to look at the cells around the query point instead of scanning every object. Hash
+        collisions only add extra candidates; every candidate is checked against its true distance.
+
+        Parameters:
+        - positions (np.ndarray): An (N, 3) array of object positions for one time step.
+        - ids (array-like): Object identifiers aligned with positions (defaults to row numbers).
+        - cell_size (float): Grid cell edge length. Queries with a radius up to cell_size touch 27 cells.
+        """
+        positions = np.asarray(positions, dtype=np.float64).reshape(-1, 3)
+        ids = np.arange(len(positions)) if ids is None else np.asarray(ids)
+
+        # Objects without a finite position can never be close to anything
+        finite = np.all(np.isfinite(positions), axis=1)
+        self.positions = positions[finite]
+        self.ids = ids[finite]
+        self.cell_size = float(cell_size)
+
+        keys = self._hash(self._cells(self.positions))
+        self.order = np.argsort(keys, kind='stable')
+        self.cell_keys, self.cell_starts, cell_counts = np.unique(keys[self.order], return_index=True, return_counts=True)
+        self.cell_ends = self.cell_starts + cell_counts
+
+    def __len__(self):
+        return len(self.positions)
+
+    @property
+    def nbytes(self):
+        # Memory held by the index arrays, for caches that budget by size
+        return sum(array.nbytes for array in (self.positions, self.ids, self.order, self.cell_keys, self.cell_starts, self.cell_ends))
+
+    def _cells(self, points):
+        return np.floor(points / self.cell_size).astype(np.int64)
+
+    @staticmethod
+    def _hash(cells):
+        # Integer overflow wraps around, which is fine for a hash
+        with np.errstate(over='ignore'):
+            return np.bitwise_xor.reduce(cells * _HASH_PRIMES, axis=-1)
+
+    @staticmethod
+    def _cube_offsets(half_width):
+        span = np.arange(-half_width, half_width + 1, dtype=np.int64)
+        return np.stack(np.meshgrid(span, span, span, indexing='ij'), axis=-1).reshape(-1, 3)
+
+    def _candidates(self, points, half_width):
+        # Gather (query row, object row) pairs for every object in the cube of cells around each query point
+        offsets = self._cube_offsets(half_width)
+        keys = self._hash(self._cells(points)[:, np.newaxis, :] + offsets[np.newaxis, :, :]).ravel()
+
+        slots = np.searchsorted(self.cell_keys, keys)
+        slots = np.minimum(slots, max(len(self.cell_keys) - 1, 0))
+        found = self.cell_keys[slots] == keys if len(self.cell_keys) else np.zeros(len(keys), dtype=bool)
+
+        # Several neighbouring cells can share a hash bucket; visit each bucket once per query
+        query_rows = np.repeat(np.arange(len(points)), len(offsets))[found]
+        slots = slots[found]
+        pairs = np.unique(np.stack([query_rows, slots], axis=1), axis=0)
+        query_rows, slots = pairs[:, 0], pairs[:, 1]
+
+        counts = self.cell_ends[slots] - self.cell_starts[slots]
+        starts = np.repeat(self.cell_starts[slots], counts)
+        within = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        return np.repeat(query_rows, counts), self.order[starts + within]
+
+    def nearest_within(self, points, radius):
+        """
+        Finds the nearest object to each query point, considering only objects within radius.
+
+        Parameters:
+        - points (np.ndarray): A (3,) query point or a (K, 3) batch of query points.
+        - radius (float): Search radius.
+
+        Returns:
+        - tuple: (distances, ids) with one entry per query point. Queries with no object inside the
+          radius get a distance of np.inf and an id of None.
+        """
+        points = np.asarray(points, dtype=np.float64)
+        single = points.ndim == 1
+        points = points.reshape(-1, 3)
+
+        distances = np.full(len(points), np.inf)
+        ids = np.full(len(points), None, dtype=object)
+        finite = np.flatnonzero(np.all(np.isfinite(points), axis=1))
+        if len(self) and len(finite):
+            half_width = max(int(np.ceil(radius / self.cell_size)), 1)
+            query_rows, object_rows = self._candidates(points[finite], half_width)
+            candidate_distances = np.linalg.norm(points[finite][query_rows] - self.positions[object_rows], axis=1)
+
+            # Sort by query, then distance, and keep the first candidate of every query
+            ranked = np.lexsort((candidate_distances, query_rows))
+            first = ranked[np.unique(query_rows[ranked], return_index=True)[1]]
+            hit = candidate_distances[first] <= radius
+            rows = finite[query_rows[first][hit]]
+            distances[rows] = candidate_distances[first][hit]
+            ids[rows] = self.ids[object_rows[first][hit]]
+
+        if single:
+            return distances[0], ids[0]
+        return distances, ids
+
+    def any_within(self, point, radius):
+        """Returns True if any object lies strictly closer than radius to point."""
+        distance, _ = self.nearest_within(point, radius)
+        return bool(distance < radius)
+
+    def k_nearest(self, point, k):
+        """
+        Finds the k objects closest to a query point.
+
+        The search grows a cube of cells around the query until the k-th best distance is guaranteed
+        to be inside it, and falls back to a full scan once the cube would cover every occupied cell.
+
+        Parameters:
+        - point (np.ndarray): A (3,) query point.
+        - k (int): Number of neighbours to return.
+
+        Returns:
+        - tuple: (distances, ids) sorted by increasing distance, with at most k entries.
+        """
+        point = np.asarray(point, dtype=np.float64).reshape(1, 3)
+        k = min(int(k), len(self))
+        if k <= 0 or not np.all(np.isfinite(point)):
+            return np.empty(0), self.ids[:0]
+
+        half_width = 1
+        while (2 * half_width + 1) ** 3 < len(self.cell_keys):
+            _, object_rows = self._candidates(point, half_width)
+            if len(object_rows) >= k:
+                candidate_distances = np.linalg.norm(self.positions[object_rows] - point, axis=1)
+                best = np.argsort(candidate_distances)[:k]
+                # Anything outside the cube is farther than half_width cells away
+                if candidate_distances[best[-1]] <= half_width * self.cell_size:
+                    return candidate_distances[best], self.ids[object_rows[best]]
+            half_width *= 2
+
+        all_distances = np.linalg.norm(self.positions - point, axis=1)
+        best = np.argpartition(all_distances, k - 1)[:k]
+        best = best[np.argsort(all_distances[best])]
+        return all_distances[best], self.ids[best]
@@ -0,0 +1,190 @@
+import numpy as np
+
+
+class StreamingConfusionMatrix:
+    def __init__(self, window=None):
+        """
+        Binary confusion matrix updated in O(1) per label, replacing lists of every true/predicted label.
+
+        Each (true, predicted) pair is counted as code 2 * true + predicted, i.e. tn, fp, fn, tp. With a
+        window, the last window pairs are kept in a ring buffer of codes and the oldest pair is subtracted
+        as a new one arrives, so the metrics describe recent steps only.
+
+        Parameters:
+        - window (int): Optional number of most recent labels to cover; None counts everything.
+        """
+        self.window = window
+        self.counts = np.zeros(4, dtype=np.int64)  # tn, fp, fn, tp
+        if window is not None:
+            self._codes = np.zeros(int(window), dtype=np.int8)
+            self._cursor = 0
+            self._size = 0
+
+    def __len__(self):
+        return int(self.counts.sum())
+
+    def update(self, true_label, predicted_label):
+        code = 2 * int(bool(true_label)) + int(bool(predicted_label))
+        if self.window is not None:
+            if self._size == self.window:
+                self.counts[self._codes[self._cursor]] -= 1
+            else:
+                self._size += 1
+            self._codes[self._cursor] = code
+            self._cursor = (self._cursor + 1) % self.window
+        self.counts[code] += 1
+
+    def update_batch(self, true_labels, predicted_labels):
+        """Counts a batch of aligned labels with one bincount."""
+        codes = (2 * (np.asarray(true_labels) != 0) + (np.asarray(predicted_labels) != 0)).astype(np.int8).ravel()
+        if self.window is not None:
+            codes = codes[-self.window:]
+            n = len(codes)
+            slots = (self._cursor + np.arange(n)) % self.window
+            evicted = max(self._size + n - self.window, 0)
+            # Empty slots are filled first, so the last evicted writes are the ones replacing held pairs
+            self.counts -= np.bincount(self._codes[slots[n - evicted:]], minlength=4)
+            self._codes[slots] = codes
+            self._cursor = (self._cursor + n) % self.window
+            self._size = min(self._size + n, self.window)
+        self.counts += np.bincount(codes, minlength=4)
+
+    def both_classes_seen(self):
+        tn, fp, fn, tp = self.counts
+        return tn + fp > 0 and fn + tp > 0
+
+    def accuracy(self):
+        total = self.counts.sum()
+        return float((self.counts[0] + self.counts[3]) / total) if total else 0.0
+
+    def precision(self):
+        # Zero when nothing was predicted positive, like sklearn's zero_division default
+        tp, fp = self.counts[3], self.counts[1]
+        return float(tp / (tp + fp)) if tp + fp else 0.0
+
+    def recall(self):
+        tp, fn = self.counts[3], self.counts[2]
+        return float(tp / (tp + fn)) if tp + fn else 0.0
+
+    def f1(self):
+        tp, fp, fn = self.counts[3], self.counts[1], self.counts[2]
+        return float(2 * tp / (2 * tp + fp + fn)) if tp else 0.0
+
+    def state_dict(self):
+        state = {'counts': self.counts.copy()}
+        if self.window is not None:
+            state.update(codes=self._codes.copy(), cursor=self._cursor, size=self._size)
+        return state
+
+    def load_state_dict(self, state):
+        self.counts[...] = state['counts']
+        if self.window is not None:
+            self._codes[...] = state['codes']
+            self._cursor = int(state['cursor'])
+            self._size = int(state['size'])
+        return self
+
+
+class StreamingMean:
+    def __init__(self, window=None):
+        """
+        Running mean updated in O(1) per value, optionally over the last window values only.
+
+        Parameters:
+        - window (int): Optional number of most recent values to cover; None averages everything.
+        """
+        self.window = window
+        self.count = 0
+        self.total = 0.0
+        if window is not None:
+            self._values = np.zeros(int(window), dtype=np.float64)
+            self._cursor = 0
+
+    def __len__(self):
+        return self.count
+
+    def update(self, value):
+        value = float(value)
+        if self.window is not None:
+            if self.count == self.window:
+                self.total -= self._values[self._cursor]
+            else:
+                self.count += 1
+            self._values[self._cursor] = value
+            self._cursor = (self._cursor + 1) % self.window
+        else:
+            self.count += 1
+        self.total += value
+
+    def mean(self):
+        if not self.count:
+            return 0.0
+        if self.window is not None:
+            return float(self._values[:self.count].mean())  # Exact sum; avoids drift from repeated subtraction
+        return self.total / self.count
+
+    def state_dict(self):
+        state = {'count': self.count, 'total': self.total}
+        if self.window is not None:
+            state.update(values=self._values.copy(), cursor=self._cursor)
+        return state
+
+    def load_state_dict(self, state):
+        self.count = int(state['count'])
+        self.total = float(state['total'])
+        if self.window is not None:
+            self._values[...] = state['values']
+            self._cursor = int(state['cursor'])
+        return self
+
+
+class TrainingMetrics:
+    def __init__(self, episode_window=None, step_window=None):
+        """
+        Evaluation metrics of a training run, kept as running counters instead of per-step lists.
+
+        Parameters:
+        - episode_window (int): Optional number of recent episodes the reward and avoidance means cover.
+        - step_window (int): Optional number of recent steps the classification metrics cover.
+        """
+        self.rewards = StreamingMean(episode_window)
+        self.avoidance = StreamingMean(episode_window)
+        self.labels = StreamingConfusionMatrix(step_window)
+
+    def record_episode(self, total_reward, collision_avoidance_rate):
+        self.rewards.update(total_reward)
+        self.avoidance.update(collision_avoidance_rate)
+
+    def record_step(self, true_label, predicted_label):
+        self.labels.update(true_label, predicted_label)
+
+    def record_steps(self, true_labels, predicted_labels):
+        self.labels.update_batch(true_labels, predicted_labels)
+
+    def evaluate(self):
+        """
+        Returns the metrics in the layout of DeepDynamicCollisionDetection.evaluate_model.
+
+        Classification scores are 0.0 unless both classes occur among the true labels.
+        """
+        scored = self.labels.both_classes_seen()
+        return {
+            'average_reward': self.rewards.mean(),
+            'collision_avoidance_rate': self.avoidance.mean(),
+            'accuracy': self.labels.accuracy() if scored else 0.0,
+            'precision': self.labels.precision() if scored else 0.0,
+            'recall': self.labels.recall() if scored else 0.0,
+            'f1_score': self.labels.f1() if scored else 0.0,
+        }
+
+    def state_dict(self):
+        state = {}
+        for name in ('rewards', 'avoidance', 'labels'):
+            state.update({f"{name}.{key}": value for key, value in getattr(self, name).state_dict().items()})
+        return state
+
+    def load_state_dict(self, state):
+        for name in ('rewards', 'avoidance', 'labels'):
+            prefix = f"{name}."
+            getattr(self, name).load_state_dict({key[len(prefix):]: value for key, value in state.items() if key.startswith(prefix)})
+        return self
@@ -0,0 +1,263 @@
+import os
+import json
+import shutil
+import numpy as np
+import pandas as pd
+
+# DataFrame.attrs flag set on catalogs whose fields are already typed and decimal-normalized
+NORMALIZED_ATTR = 'tle_normalized'
+
+# Column types of the binary store, in complete_preprocessing.py column order
+TLE_STORE_DTYPES = {
+    'Line1_Num': 'int32',
+    'Satellite_Num': 'int32',
+    'Intl_Designator': '<U8',
+    'Epoch_Year_Day': 'float64',
+    'First_Derivative': 'float64',
+    'Second_Derivative': 'float64',
+    'BSTAR': 'float64',
+    'Ephemeris_Type': 'int32',
+    'Element_Set_Num': 'int32',
+    'Line2_Num': 'int32',
+    'Satellite_Num_2': 'int32',
+    'Inclination_deg': 'float64',
+    'RAAN_deg': 'float64',
+    'Eccentricity': 'float64',
+    'Argument_of_Perigee_deg': 'float64',
+    'Mean_Anomaly_deg': 'float64',
+    'Mean_Motion': 'float64',
+    'Rev_at_Epoch': 'int32',
+}
+
+# Fields written by TLEs with an implied leading decimal point
+IMPLIED_DECIMAL_COLUMNS = ['Eccentricity']
+# Fields written by TLEs as an implied-decimal mantissa with a power-of-ten exponent, e.g. '-11606-4'
+IMPLIED_EXPONENT_COLUMNS = ['Second_Derivative', 'BSTAR']
+# NORAD catalog number fields; numbers past 99999 are written in Alpha-5 form, e.g. 'A0001' for 100001
+CATALOG_NUMBER_COLUMNS = ['Satellite_Num', 'Satellite_Num_2']
+# Alpha-5 leading letters worth 10 to 33 (I and O are skipped to avoid confusion with 1 and 0)
+ALPHA5_LETTERS = 'ABCDEFGHJKLMNPQRSTUVWXYZ'
+
+
+def _parse_implied_exponent(values):
+    # ' 12345-3' -> 0.12345e-3; blanks and malformed fields become NaN
+    text = values.astype(str).str.strip()
+    parts = text.str.extract(r'^([+-]?)(\d+)([+-]\d)$')
+    mantissa = pd.to_numeric('0.' + parts[1], errors='coerce')
+    exponent = pd.to_numeric(parts[2], errors='coerce')
+    sign = np.where(parts[0] == '-', -1.0, 1.0)
+    return (sign * mantissa * 10.0 ** exponent).to_numpy(dtype=np.float64)
+
+
+def decode_catalog_numbers(values):
+    """
+    Converts NORAD catalog numbers to integers, decoding the Alpha-5 form ('A0001' -> 100001).
+
+    Parameters:
+    - values (array-like): Catalog numbers as text (raw TLE fields or CSV values) or integers.
+
+    Returns:
+    - np.ndarray: int64 catalog numbers; blank or malformed fields become -1.
+    """
+    values = pd.Series(values)
+    if values.dtype.kind in 'iu':
+        return values.to_numpy(dtype=np.int64)
+    text = values.astype(str).str.strip().str.upper()
+    numeric = pd.to_numeric(text, errors='coerce')
+    parts = text.str.extract(r'^([A-HJ-NP-Z])(\d{4})$')
+    letter = parts[0].map({letter: 10 + i for i, letter in enumerate(ALPHA5_LETTERS)})
+    alpha5 = letter * 10000 + pd.to_numeric(parts[1], errors='coerce')
+    return numeric.fillna(alpha5).fillna(-1).to_numpy().astype(np.int64)
+
+
+def normalize_tle_columns(tle_df):
+    """
+    Converts a TLE catalog with raw text fields into typed columns with decimal points normalized.
+
+    Parameters:
+    - tle_df (pd.DataFrame): Catalog in the complete_preprocessing.py column schema, as parsed from TLE
+      text or read back from the CSV.
+
+    Returns:
+    - pd.DataFrame: The catalog with the TLE_STORE_DTYPES column types, flagged as normalized in attrs.
+    """
+    if tle_df.attrs.get(NORMALIZED_ATTR, False):
+        return tle_df
+
+    columns = {}
+    for name in tle_df.columns:
+        dtype = np.dtype(TLE_STORE_DTYPES.get(name, 'object'))
+        if name in IMPLIED_EXPONENT_COLUMNS:
+            values = _parse_implied_exponent(tle_df[name])
+        elif name in IMPLIED_DECIMAL_COLUMNS:
+            digits = tle_df[name].astype(str).str.strip().str.split('.').str[0]
+            values = pd.to_numeric('0.' + digits.str.zfill(7), errors='coerce').to_numpy(dtype=np.float64)
+        elif dtype.kind == 'f':
+            values = pd.to_numeric(tle_df[name], errors='coerce').to_numpy(dtype=np.float64)
+        elif name in CATALOG_NUMBER_COLUMNS:
+            values = decode_catalog_numbers(tle_df[name]).astype(dtype)
+        elif dtype.kind == 'i':
+            # Missing or non-numeric fields are stored as -1
+            values = pd.to_numeric(tle_df[name], errors='coerce').fillna(-1).to_numpy().astype(dtype)
+        else:
+            values = tle_df[name].fillna('').astype(str).to_numpy().astype(dtype) if dtype.kind == 'U' else tle_df[name].to_numpy()
+        columns[name] = values
+
+    normalized = pd.DataFrame(columns, index=tle_df.index)
+    normalized.attrs[NORMALIZED_ATTR] = True
+    return normalized
+
+
+def write_tle_store(tle_df, store_path):
+    """
+    Writes a catalog as a typed binary columnar store: a directory holding one .npy file per column.
+
+    The new store is written next to the old one and swapped in with renames, so readers never see a
+    half-written catalog.
+
+    Parameters:
+    - tle_df (pd.DataFrame): Catalog in the complete_preprocessing.py column schema (raw or normalized).
+    - store_path (str): Directory to write, e.g. 'data/tle_data.store'.
+    """
+    tle_df = normalize_tle_columns(tle_df)
+    store_path = os.path.normpath(store_path)
+    temp_path = f"{store_path}.{os.getpid()}.tmp"
+    shutil.rmtree(temp_path, ignore_errors=True)
+    os.makedirs(temp_path)
+
+    for name in tle_df.columns:
+        values = tle_df[name].to_numpy()
+        if name in TLE_STORE_DTYPES:
+            values = values.astype(TLE_STORE_DTYPES[name])
+        elif values.dtype.kind == 'O':
+            values = values.astype(str)  # pandas keeps text as objects; store it as fixed-width unicode
+        np.save(os.path.join(temp_path, f"{name}.npy"), np.ascontiguousarray(values), allow_pickle=False)
+    with open(os.path.join(temp_path, "columns.json"), 'w') as file:
+        json.dump({'columns': list(tle_df.columns), 'rows': len(tle_df)}, file)
+
+    old_path = f"{store_path}.{os.getpid()}.old"
+    if os.path.exists(store_path):
+        os.rename(store_path, old_path)
+    os.rename(temp_path, store_path)
+    shutil.rmtree(old_path, ignore_errors=True)
+
+
+def is_tle_store(path):
+    return os.path.isfile(os.path.join(path, "columns.json"))
+
+
+def load_tle_columns(store_path, mmap=True):
+    """Returns the store's columns as a dict of NumPy arrays, memory-mapped read-only by default."""
+    with open(os.path.join(store_path, "columns.json")) as file:
+        names = json.load(file)['columns']
+    return {name: np.load(os.path.join(store_path, f"{name}.npy"), mmap_mode='r' if mmap else None) for name in names}
+
+
+def load_tle_store(store_path):
+    """
+    Loads a store written by write_tle_store as a DataFrame without any text parsing.
+
+    The columns are read into memory: pandas copies them into its own blocks either way, so mapping the
+    files first would only add a copy. Use load_tle_columns for memory-mapped access to single columns.
+
+    Parameters:
+    - store_path (str): Store directory.
+
+    Returns:
+    - pd.DataFrame: The typed, normalized catalog.
+    """
+    tle_df = pd.DataFrame(load_tle_columns(store_path, mmap=False), copy=False)
+    tle_df.attrs[NORMALIZED_ATTR] = True
+    return tle_df
+
+
+def load_tle_catalog(path):
+    # Load a TLE catalog from either a binary store directory or the CSV written by complete_preprocessing.py
+    if is_tle_store(path):
+        return load_tle_store(path)
+    return pd.read_csv(path, low_memory=False)
+
+
+def epoch_sort_key(epoch_year_day):
+    # TLE epochs are YYDDD.dddddddd with a two-digit year (57-99 -> 19xx, 00-56 -> 20xx); make them comparable
+    epoch_year_day = np.asarray(epoch_year_day, dtype=np.float64)
+    yy = np.floor(epoch_year_day / 1000.0)
+    year = np.where(yy < 57, 2000 + yy, 1900 + yy)
+    return year * 1000.0 + (epoch_year_day - yy * 1000.0)
+
+
+def merge_tle_catalog(existing_df, new_df):
+    """
+    Merges a batch of new TLEs into a catalog, keeping the newest epoch per satellite.
+
+    Existing rows keep their position (updated objects are replaced in place) and objects seen for the
+    first time are appended, so row order stays stable between updates.
+
+    Parameters:
+    - existing_df (pd.DataFrame): The current catalog (raw or normalized).
+    - new_df (pd.DataFrame): The new TLE batch in the same column schema.
+
+    Returns:
+    - tuple: (merged_df, report) where report is a dict with 'added' and 'updated' arrays of
+      Satellite_Num values, 'changed' (both combined), the 'unchanged' row count and the number of new
+      rows 'skipped' for lacking a valid catalog number.
+    """
+    existing_df = normalize_tle_columns(existing_df).reset_index(drop=True)
+    new_df = normalize_tle_columns(new_df).reset_index(drop=True)
+
+    # Rows without a usable catalog number (-1) cannot be matched to an object: existing ones are kept
+    # as they are, new ones are skipped rather than merged with each other under the shared -1
+    skipped = int((new_df['Satellite_Num'] < 0).sum())
+    new_df = new_df[new_df['Satellite_Num'] >= 0]
+
+    # One row per object: the newest epoch wins (the first row wins ties within the existing catalog)
+    existing_df = existing_df.iloc[np.argsort(-epoch_sort_key(existing_df['Epoch_Year_Day']), kind='stable')]
+    existing_df = existing_df[~existing_df['Satellite_Num'].duplicated() | (existing_df['Satellite_Num'] < 0)].sort_index()
+    new_df = new_df.iloc[np.argsort(epoch_sort_key(new_df['Epoch_Year_Day']), kind='stable')]
+    new_df = new_df.drop_duplicates('Satellite_Num', keep='last')
+
+    identified = (existing_df['Satellite_Num'] >= 0).to_numpy()
+    current = pd.Series(epoch_sort_key(existing_df['Epoch_Year_Day'])[identified], index=existing_df['Satellite_Num'].to_numpy()[identified])
+    incoming = epoch_sort_key(new_df['Epoch_Year_Day'])
+    known = new_df['Satellite_Num'].isin(current.index).to_numpy()
+    previous = current.reindex(new_df['Satellite_Num'].to_numpy()).to_numpy()
+
+    updated = new_df[known & (incoming > previous)]
+    added = new_df[~known]
+
+    # Updated rows take the slot of the row they replace; added rows go after everything else
+    replaced = existing_df['Satellite_Num'].isin(updated['Satellite_Num']).to_numpy()
+    slots = np.concatenate([
+        np.flatnonzero(~replaced),
+        np.flatnonzero(identified)[current.index.get_indexer(updated['Satellite_Num'])],
+        len(existing_df) + np.arange(len(added)),
+    ])
+    merged = pd.concat([existing_df[~replaced], updated, added], ignore_index=True)
+    merged = merged.iloc[np.argsort(slots, kind='stable')].reset_index(drop=True)
+    merged.attrs[NORMALIZED_ATTR] = True
+
+    report = {
+        'added': added['Satellite_Num'].to_numpy(),
+        'updated': updated['Satellite_Num'].to_numpy(),
+        'unchanged': len(existing_df) - len(updated),
+        'skipped': skipped,
+    }
+    report['changed'] = np.concatenate([report['updated'], report['added']])
+    return merged, report
+
+
+def update_tle_store(new_df, store_path):
+    """
+    Merges a new TLE batch into a binary store (creating it if needed) and reports what changed.
+
+    Parameters:
+    - new_df (pd.DataFrame): The new TLE batch in the complete_preprocessing.py column schema.
+    - store_path (str): Store directory.
+
+    Returns:
+    - dict: The merge report from merge_tle_catalog.
+    """
+    existing_df = load_tle_store(store_path) if is_tle_store(store_path) else new_df.iloc[:0]
+    merged, report = merge_tle_catalog(existing_df, new_df)
+    write_tle_store(merged, store_path)
+    return report
@@ -0,0 +1,105 @@
+import ast
+import numpy as np
+
+# Functions trajectory equations may call; NumPy ufuncs so whole time grids evaluate in one call
+EQUATION_FUNCTIONS = {'cos': np.cos, 'sin': np.sin, 'exp': np.exp}
+EQUATION_NAMESPACE = {'__builtins__': {}, **EQUATION_FUNCTIONS}
+EQUATION_OPERATORS = (ast.Add, ast.Sub, ast.Mult, ast.Div, ast.Pow)
+
+
+def _check_node(node, expression):
+    # Allowlist: numeric constants, t, + - * / **, unary minus and one-argument calls of EQUATION_FUNCTIONS
+    if isinstance(node, ast.Constant) and type(node.value) in (int, float):
+        return
+    if isinstance(node, ast.Name) and node.id == 't':
+        return
+    if isinstance(node, ast.BinOp) and isinstance(node.op, EQUATION_OPERATORS):
+        _check_node(node.left, expression)
+        _check_node(node.right, expression)
+        return
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.USub):
+        _check_node(node.operand, expression)
+        return
+    if (isinstance(node, ast.Call) and isinstance(node.func, ast.Name) and node.func.id in EQUATION_FUNCTIONS
+            and len(node.args) == 1 and not node.keywords):
+        _check_node(node.args[0], expression)
+        return
+    raise ValueError(f"Unsupported {type(node).__name__} in trajectory equation {expression!r}")
+
+
+def parse_equation(expression):
+    """
+    Parses the right-hand side of a trajectory equation, accepting only arithmetic in t.
+
+    Equations can arrive from outside the process (InferenceServer requests), and eval() with empty
+    builtins is not a sandbox, so every node is checked against an allowlist before anything is compiled.
+    Integer constants become floats, so huge powers overflow instead of running big-integer arithmetic.
+
+    Parameters:
+    - expression (str): An expression such as '13.719 + 98.0 * t * cos(0.78)'.
+
+    Returns:
+    - ast.Expression: The validated expression tree, ready for compile().
+
+    Raises:
+    - ValueError: If the expression is not valid Python or uses anything outside the allowlist.
+    """
+    try:
+        tree = ast.parse(expression, mode='eval')
+    except SyntaxError as e:
+        raise ValueError(f"Invalid trajectory equation {expression!r}: {e.msg}") from None
+    _check_node(tree.body, expression)
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Constant):
+            node.value = float(node.value)
+    return tree
+
+
+def compile_equation(equation_str):
+    """
+    Compiles a trajectory equation string into a function of time.
+
+    Parameters:
+    - equation_str (str): An equation such as 'x(t) = 13.719 + 98.0 * t * cos(0.78)', optionally with
+      trailing terms like '+ 10' appended by optimize_trajectory. The 'name(t) =' prefix is optional.
+
+    Returns:
+    - Callable: A function taking a scalar or NumPy array of times and returning values of the same shape.
+
+    Raises:
+    - ValueError: If the equation uses anything but numbers, t, + - * / **, unary minus and cos/sin/exp.
+    """
+    expression = equation_str.split('=', 1)[1] if '=' in equation_str else equation_str
+    code = compile(parse_equation(expression.strip()), f"<{equation_str.strip()}>", 'eval')
+
+    def func(t):
+        t = np.asarray(t, dtype=np.float64)
+        # Constant terms (e.g. z(t) = 0.0) still need one value per time sample
+        return np.broadcast_to(eval(code, EQUATION_NAMESPACE, {'t': t}), t.shape)
+
+    return func
+
+
+class CompiledTrajectory:
+    def __init__(self, equations, axes=('x', 'y', 'z')):
+        """
+        Compiles the parametric equations returned by TrajectoryCalculator.calculate_trajectory.
+
+        Parameters:
+        - equations (dict): Parametric equations as strings, keyed by axis name.
+        - axes (tuple): The equations to evaluate, in output column order.
+        """
+        self.source = tuple(equations[axis] for axis in axes)
+        self.funcs = [compile_equation(equation) for equation in self.source]
+
+    def __call__(self, t):
+        """
+        Evaluates the trajectory at time t.
+
+        Parameters:
+        - t (float or array-like): A single time or a vector of T times.
+
+        Returns:
+        - np.ndarray: A (3,) position for a scalar t, or a (T, 3) array for a vector of times.
+        """
+        return np.stack([func(t) for func in self.funcs], axis=-1)